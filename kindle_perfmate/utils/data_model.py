@@ -1,10 +1,19 @@
 # utils/data_model.py
 import json
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Any, Optional
 
-@dataclass
+# Priority levels that have test case templates, and the choices offered in the priority combos
+PRIORITY_LEVELS: tuple[str, ...] = ("P0", "P1", "P2", "P3", "750")
+PRIORITY_CHOICES: tuple[str, ...] = ("All",) + PRIORITY_LEVELS
+PRIORITY_CHOICES_SET = frozenset(PRIORITY_CHOICES)
+
+def _iso_now() -> str:
+    """Default factory for timestamps (module-level so bulk loaders can patch it)."""
+    return datetime.now().isoformat()
+
+@dataclass(slots=True)
 class Iteration:
     """Represents a single test iteration result."""
     time_ms: Optional[float] = None  # Time in milliseconds
@@ -12,45 +21,85 @@ class Iteration:
     skipped: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return self.__dict__
+        return {"time_ms": self.time_ms, "notes": self.notes, "skipped": self.skipped}
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Iteration':
         return Iteration(**data)
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Represents a single performance test case."""
     name: str
-    steps: List[str] = field(default_factory=list)
+    steps: List[str] = field(default_factory=list) # Read-only, may be shared with a cached template: assign a new list to change it
     baseline_ms: Optional[float] = None # Baseline time in milliseconds
     priority: str = "P3" # e.g., P0, P1, P2, P3, 750
-    iterations: List[Iteration] = field(default_factory=lambda: [Iteration() for _ in range(5)]) # Fixed 5 iterations
+    iterations: List[Iteration] = field(default_factory=list) # Fixed 5 iterations, filled in __post_init__ if not given
     test_notes: str = "" # Notes specific to this test case
     quip_url: str = ""
+    _baseline_fmt: Optional[tuple] = field(default=None, init=False, repr=False, compare=False) # (baseline_ms, text) for baseline_ms_fmt
+    _quip_html: Optional[tuple] = field(default=None, init=False, repr=False, compare=False) # (quip_url, html) for quip_html
+    _first_empty: Optional[int] = field(default=None, init=False, repr=False, compare=False) # first_empty_iter, None until first read
+
+    def __post_init__(self):
+        if not self.iterations:
+            self.iterations = [Iteration() for _ in range(5)]
+
+    @property
+    def baseline_ms_fmt(self) -> str:
+        """baseline_ms formatted with format_time, cached until baseline_ms changes."""
+        cached = self._baseline_fmt
+        if cached is None or cached[0] != self.baseline_ms:
+            from .timer_utils import format_time # Not at module level, timer_utils imports this module
+            cached = self._baseline_fmt = (self.baseline_ms, format_time(self.baseline_ms))
+        return cached[1]
+
+    @property
+    def quip_html(self) -> str:
+        """Rich text "Quip URL: <link>" label text, cached until quip_url changes."""
+        cached = self._quip_html
+        if cached is None or cached[0] != self.quip_url:
+            url = self.quip_url
+            html = f'Quip URL: <a href="{url}">{url}</a>' if url else "Quip URL: --"
+            cached = self._quip_html = (url, html)
+        return cached[1]
+
+    @property
+    def first_empty_iter(self) -> int:
+        """Index of the first iteration without a time (len(iterations) if all are filled).
+
+        Cached, report changes made to iterations through iteration_changed().
+        """
+        first = self._first_empty
+        if first is None:
+            first = self._first_empty = self._scan_empty(0)
+        return first
+
+    def iteration_changed(self, index: int):
+        """Keeps first_empty_iter current after iterations[index] was filled or cleared."""
+        first = self._first_empty
+        if first is None:
+            return # Not read yet, computed from scratch on first read
+        if self.iterations[index].time_ms is None:
+            self._first_empty = min(first, index)
+        elif index == first:
+            self._first_empty = self._scan_empty(index + 1) # Scan forward from the newly filled one
+
+    def _scan_empty(self, start: int) -> int:
+        iterations = self.iterations
+        return next((i for i in range(start, len(iterations)) if iterations[i].time_ms is None), len(iterations))
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "steps": self.steps,
-            "baseline_ms": self.baseline_ms,
-            "priority": self.priority,
-            "iterations": [iter.to_dict() for iter in self.iterations],
-            "test_notes": self.test_notes,
-            "quip_url": self.quip_url
-        }
+        data = {name: getattr(self, name) for name in _TC_FIELDS}
+        data["iterations"] = [iter.to_dict() for iter in self.iterations]
+        return data
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'TestCase':
-        data['iterations'] = [Iteration.from_dict(iter_data) for iter_data in data.get('iterations', [{} for _ in range(5)])]
-        # Ensure exactly 5 iterations are created if fewer were saved or none exist
-        while len(data['iterations']) < 5:
-            data['iterations'].append(Iteration())
-        data['iterations'] = data['iterations'][:5] # Trim if somehow more than 5 were saved
-        return TestCase(**data)
+        return TestCase(**{name: conv(data[name]) for name, conv in _TC_CONVERTERS.items() if name in data})
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Represents a performance test session (project)."""
     week: str = ""
@@ -58,26 +107,45 @@ class Session:
     build: str = ""
     priority_filter: str = "All" # The filter applied in the UI for this session
     test_cases: List[TestCase] = field(default_factory=list)
-    start_time: str = field(default_factory=lambda: datetime.now().isoformat())
+    start_time: str = field(default_factory=_iso_now)
     end_time: Optional[str] = None
     global_notes: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "week": self.week,
-            "device": self.device,
-            "build": self.build,
-            "priority_filter": self.priority_filter,
-            "test_cases": [tc.to_dict() for tc in self.test_cases],
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-            "global_notes": self.global_notes
-        }
+        data = {name: getattr(self, name) for name in _SESSION_FIELDS}
+        data["test_cases"] = [tc.to_dict() for tc in self.test_cases]
+        return data
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Session':
-        data['test_cases'] = [TestCase.from_dict(tc_data) for tc_data in data.get('test_cases', [])]
-        return Session(**data)
+        return Session(**{name: conv(data[name]) for name, conv in _SESSION_CONVERTERS.items() if name in data})
+
+
+# Field names and per-field converters, computed once so to_dict/from_dict
+# don't rebuild the field layout on every call.
+def _identity(value: Any) -> Any:
+    return value
+
+_ITER_FROM = Iteration.from_dict
+_TC_FROM = TestCase.from_dict
+
+def _iterations_from_list(items: Optional[List[Dict[str, Any]]]) -> List[Iteration]:
+    iterations = list(map(_ITER_FROM, (items or ())[:5])) # Trim if somehow more than 5 were saved
+    # Ensure exactly 5 iterations exist if fewer were saved
+    while len(iterations) < 5:
+        iterations.append(Iteration())
+    return iterations
+
+def _test_cases_from_list(items: Optional[List[Dict[str, Any]]]) -> List[TestCase]:
+    return list(map(_TC_FROM, items or ()))
+
+_TC_FIELDS = tuple(f.name for f in fields(TestCase) if f.init) # Skips internal caches
+_SESSION_FIELDS = tuple(f.name for f in fields(Session))
+
+_TC_CONVERTERS = {name: _identity for name in _TC_FIELDS}
+_TC_CONVERTERS["iterations"] = _iterations_from_list
+_SESSION_CONVERTERS = {name: _identity for name in _SESSION_FIELDS}
+_SESSION_CONVERTERS["test_cases"] = _test_cases_from_list
 
 # Example Usage (for testing data model)
 if __name__ == '__main__':
@@ -1,98 +1,298 @@
 # utils/file_manager.py
 import json
+import logging
 import os
+from datetime import datetime
 from typing import Optional, List, Dict, Any
-from .data_model import Session, TestCase
+from .data_model import Session, TestCase, Iteration
 import csv # For basic CSV export
 # import openpyxl # Optional: For Excel export
 # import pandas as pd # Optional: For easier Excel/CSV handling
 
+log = logging.getLogger(__name__)
+
+# Optional JSON backends, fastest first: orjson, then ujson, then the stdlib json module.
+# Files are always read/written as bytes so callers don't care which one is active.
+try:
+    import orjson
+
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(obj: Any, indent: bool = False) -> bytes:
+            return ujson.dumps(obj, indent=2 if indent else 0, ensure_ascii=False,
+                               escape_forward_slashes=False).encode('utf-8')
+
+        def _loads(data: bytes) -> Any:
+            return ujson.loads(data)
+    except ImportError:
+        def _dumps(obj: Any, indent: bool = False) -> bytes:
+            if indent:
+                return json.dumps(obj, indent=2).encode('utf-8')
+            return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+        def _loads(data: bytes) -> Any:
+            return json.loads(data)
+
+# Optional: ijson lets list_sessions() read session headers without building every test case.
+# Only worth it with the C backend; the pure-Python one is slower than a full orjson parse.
+try:
+    import ijson
+    if ijson.backend != "yajl2_c":
+        ijson = None
+except ImportError:
+    ijson = None
+
 # --- Configuration ---
 # Get user's home directory and create a hidden directory for app data
 APP_DATA_DIR = os.path.join(os.path.expanduser("~"), ".kindleperfmate")
 SESSIONS_DIR = os.path.join(APP_DATA_DIR, "sessions")
 TEMPLATES_DIR = os.path.join(APP_DATA_DIR, "templates")
+# Cached session header info, keyed by filename and validated against file mtime/size
+SESSIONS_INDEX_FILE = os.path.join(SESSIONS_DIR, ".index.json")
 
 # Ensure directories exist
 os.makedirs(SESSIONS_DIR, exist_ok=True)
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 
 # --- Session Management ---
+_FILENAME_PART_TABLE = str.maketrans({" ": "_", "/": "-"})
+
+def safe_filename_part(text: str) -> str:
+    """Makes a session field usable in a file name (spaces to '_', slashes to '-'), in one pass."""
+    return text.translate(_FILENAME_PART_TABLE)
+
+def _write_atomic(filepath: str, data: bytes):
+    """Writes data to a temp file next to filepath, then swaps it into place.
+
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def save_session(session: Session, filename: Optional[str] = None) -> str:
     """Saves the current session to a JSON file."""
     if filename is None:
         # Generate a default filename based on session info
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_week = session.week.replace(" ", "_").replace("/", "-")
-        safe_device = session.device.replace(" ", "_").replace("/", "-")
+        safe_week = safe_filename_part(session.week)
+        safe_device = safe_filename_part(session.device)
         filename = f"session_{safe_week}_{safe_device}_{timestamp}.json"
 
-    filepath = os.path.join(SESSIONS_DIR, filename)
+    return save_session_data(session.to_dict(), os.path.join(SESSIONS_DIR, filename))
+
+def save_session_data(data: Dict[str, Any], filepath: str) -> str:
+    """Writes a session already converted with Session.to_dict() to filepath.
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(session.to_dict(), f, indent=2)
+    to_dict() builds fresh dicts/lists of plain values, except the steps lists, which are
+    read-only references shared with the session. So it can be taken on the GUI thread and
+    written from a worker while the live session keeps changing.
+    """
+    _write_atomic(filepath, _dumps(data)) # Compact: sessions are machine-read
 
-    print(f"Session saved to {filepath}")
+    log.debug("Session saved to %s", filepath)
     return filepath # Return the path where it was saved
 
 def load_session(filepath: str) -> Optional[Session]:
     """Loads a session from a JSON file."""
-    if not os.path.exists(filepath):
-        print(f"Error: File not found at {filepath}")
-        return None
-
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = _loads(f.read())
             return Session.from_dict(data)
+    except FileNotFoundError:
+        log.error("File not found at %s", filepath)
+        return None
     except Exception as e:
-        print(f"Error loading session from {filepath}: {e}")
+        log.error("Error loading session from %s: %s", filepath, e)
         return None
 
-def list_sessions() -> List[Dict[str, Any]]:
-    """Lists available session files with basic info (requires loading each partially or relying on filename)."""
-    sessions_list = []
-    for filename in os.listdir(SESSIONS_DIR):
-        if filename.endswith(".json"):
-            filepath = os.path.join(SESSIONS_DIR, filename)
+_SESSION_HEADER_FIELDS = ("week", "device", "build", "start_time")
+_SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+def _read_session_header(filepath: str) -> Dict[str, Any]:
+    """Reads the header fields shown in the history list from a session file."""
+    if ijson is None:
+        with open(filepath, 'rb') as f:
+            session_data = _loads(f.read())
+        return {
+            "week": session_data.get("week", "N/A"),
+            "device": session_data.get("device", "N/A"),
+            "build": session_data.get("build", "N/A"),
+            "start_time": session_data.get("start_time", "N/A"),
+            "test_case_count": len(session_data.get("test_cases", []))
+        }
+
+    # Stream the file: keep the top-level scalars, only count the test cases
+    header = {}
+    test_case_count = 0
+    test_cases_done = False
+    with open(filepath, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "test_cases.item" and event == "start_map":
+                test_case_count += 1
+            elif prefix == "test_cases" and event == "end_array":
+                test_cases_done = True
+            elif prefix in _SESSION_HEADER_FIELDS and event in _SCALAR_EVENTS:
+                header[prefix] = value
+            else:
+                continue
+            if test_cases_done and len(header) == len(_SESSION_HEADER_FIELDS):
+                break # Nothing else in the file is needed (e.g. long global notes)
+    for name in _SESSION_HEADER_FIELDS:
+        header.setdefault(name, "N/A")
+    header["test_case_count"] = test_case_count
+    return header
+
+def _load_sessions_index() -> Dict[str, Dict[str, Any]]:
+    """Loads the session header index, returning an empty index if missing or corrupt."""
+    try:
+        with open(SESSIONS_INDEX_FILE, 'rb') as f:
+            index = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+def _save_sessions_index(index: Dict[str, Dict[str, Any]]):
+    """Writes the session header index. Failure only costs a re-parse next time."""
+    try:
+        _write_atomic(SESSIONS_INDEX_FILE, _dumps(index))
+    except OSError as e:
+        log.warning("Could not write session index %s: %s", SESSIONS_INDEX_FILE, e)
+
+class SessionList:
+    """Session header info from list_sessions(), stored column-wise.
+
+    Each field is its own list (filenames, weeks, start_times, ...) so sorting
+    and filtering work on a single column. Iterating or indexing yields one
+    info dict per session, like a plain list of dicts.
+    """
+    __slots__ = ("filenames", "filepaths", "weeks", "devices", "builds", "start_times", "test_case_counts")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, [])
+
+    def append(self, filename: str, filepath: str, week: str, device: str, build: str,
+               start_time: str, test_case_count: int):
+        self.filenames.append(filename)
+        self.filepaths.append(filepath)
+        self.weeks.append(week)
+        self.devices.append(device)
+        self.builds.append(build)
+        self.start_times.append(start_time)
+        self.test_case_counts.append(test_case_count)
+
+    def reorder(self, order: List[int]):
+        """Reorders every column by the given row indices."""
+        for name in self.__slots__:
+            column = getattr(self, name)
+            setattr(self, name, [column[i] for i in order])
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Returns the info dict for one session."""
+        return {
+            "filename": self.filenames[index],
+            "filepath": self.filepaths[index],
+            "week": self.weeks[index],
+            "device": self.devices[index],
+            "build": self.builds[index],
+            "start_time": self.start_times[index],
+            "test_case_count": self.test_case_counts[index]
+        }
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.row(index)
+
+    def __iter__(self):
+        return map(self.row, range(len(self.filenames)))
+
+
+def sessions_dir_state() -> frozenset:
+    """(name, mtime_ns, size) of every session file list_sessions() would read.
+
+    Cheap to compare: it tells changes to the sessions themselves apart from
+    writes of the index or temp files in the same directory.
+    """
+    try:
+        with os.scandir(SESSIONS_DIR) as entries:
+            return frozenset((entry.name, stat.st_mtime_ns, stat.st_size)
+                             for entry in entries
+                             if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file()
+                             for stat in (entry.stat(),))
+    except OSError:
+        return frozenset()
+
+def list_sessions() -> SessionList:
+    """Lists available session files with basic info, newest first.
+
+    Header info is cached in SESSIONS_INDEX_FILE; a file is only re-parsed
+    when its mtime or size no longer match the cached entry.
+    """
+    index = _load_sessions_index()
+    new_index = {}
+    index_dirty = False
+    sessions = SessionList()
+    with os.scandir(SESSIONS_DIR) as entries:
+        for entry in entries:
+            filename = entry.name
+            if not filename.endswith(".json") or filename.startswith(".") or not entry.is_file():
+                continue # Skip non-session files and the index itself
+            filepath = entry.path
             try:
-                # Load partial data to get session info without parsing all test cases
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    # Read only the beginning to get week, device, build, start_time
-                    # This is a simplified approach; full load is safer but slower for many files.
-                    # A better approach for large history is a separate index file or SQLite.
-                    # For now, let's do a full load as sessions aren't expected to be huge initially.
-                    session_data = json.load(f)
-                    sessions_list.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "week": session_data.get("week", "N/A"),
-                        "device": session_data.get("device", "N/A"),
-                        "build": session_data.get("build", "N/A"),
-                        "start_time": session_data.get("start_time", "N/A"),
-                        "test_case_count": len(session_data.get("test_cases", []))
-                    })
+                stat = entry.stat()
+                header = index.get(filename)
+                if header is None or header.get("mtime") != stat.st_mtime_ns or header.get("size") != stat.st_size:
+                    header = _read_session_header(filepath)
+                    header["mtime"] = stat.st_mtime_ns
+                    header["size"] = stat.st_size
+                    index_dirty = True
+                new_index[filename] = header
+                sessions.append(filename, filepath, header["week"], header["device"], header["build"],
+                                header["start_time"], header["test_case_count"])
             except Exception as e:
-                print(f"Warning: Could not read info from {filename}: {e}")
-                sessions_list.append({
-                    "filename": filename,
-                    "filepath": filepath,
-                    "week": "Error", "device": "Error", "build": "Error", "start_time": "Error", "test_case_count": 0
-                })
-    # Sort by time, newest first (requires parsing date strings)
-    sessions_list.sort(key=lambda x: x.get("start_time", ""), reverse=True)
-    return sessions_list
+                log.warning("Could not read info from %s: %s", filename, e)
+                sessions.append(filename, filepath, "Error", "Error", "Error", "Error", 0)
+
+    # Rewrite the index only if entries were added, changed or removed
+    if index_dirty or len(new_index) != len(index):
+        _save_sessions_index(new_index)
+
+    # Sort by time, newest first (ISO timestamps sort as strings)
+    start_times = sessions.start_times
+    sessions.reorder(sorted(range(len(start_times)), key=start_times.__getitem__, reverse=True))
+    return sessions
 
 
 # --- Test Case Templates ---
+# Parsed template files: path -> (mtime_ns, size, decoded JSON list)
+_template_cache: Dict[str, tuple] = {}
+
 def load_test_case_template(priority: str) -> List[TestCase]:
     """Loads test case definitions from a template file based on priority."""
     # Define a simple template file naming convention
     template_file = os.path.join(TEMPLATES_DIR, f"test_cases_{priority.lower()}.json")
 
     if not os.path.exists(template_file):
-        print(f"Warning: Template file not found for priority '{priority}' at {template_file}.")
-        print("Loading sample data or returning empty list.")
+        log.warning("Template file not found for priority '%s' at %s. Loading sample data or returning empty list.",
+                    priority, template_file)
         # --- Create a sample template if not found ---
         if priority == "P0":
              sample_data = [
@@ -111,68 +311,84 @@ def load_test_case_template(priority: str) -> List[TestCase]:
         # Save sample data as a template file for next time
         try:
             os.makedirs(TEMPLATES_DIR, exist_ok=True)
-            with open(template_file, 'w', encoding='utf-8') as f:
-                json.dump([tc.to_dict() for tc in sample_data], f, indent=2)
-            print(f"Created sample template: {template_file}")
+            with open(template_file, 'wb') as f:
+                f.write(_dumps([tc.to_dict() for tc in sample_data], indent=True))
+            log.debug("Created sample template: %s", template_file)
             return sample_data # Return the sample data we just created
         except Exception as e:
-             print(f"Error creating sample template: {e}")
+             log.error("Error creating sample template: %s", e)
              return [] # Return empty if cannot create sample
 
 
     try:
-        with open(template_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Assuming the JSON is a list of TestCase dictionaries
-            return [TestCase.from_dict(tc_data) for tc_data in data]
+        # Templates are read-only in practice, so reuse the parsed data until the file changes
+        stat = os.stat(template_file)
+        cached = _template_cache.get(template_file)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            data = cached[2]
+        else:
+            with open(template_file, 'rb') as f:
+                data = _loads(f.read())
+            _template_cache[template_file] = (stat.st_mtime_ns, stat.st_size, data)
+        # Assuming the JSON is a list of TestCase dictionaries.
+        # Fresh TestCase objects every call: sessions must never share (and mutate) the cached data.
+        # Only the read-only steps lists are shared, everything that gets edited is built anew.
+        return [TestCase.from_dict(tc_data) for tc_data in data]
     except Exception as e:
-        print(f"Error loading template from {template_file}: {e}")
+        log.error("Error loading template from %s: %s", template_file, e)
         return []
 
 # --- Exporting Data ---
+_CSV_HEADER = (["Test Case", "Priority"]
+               + [col for i in range(1, 6)
+                  for col in (f"Iteration {i} (ms)", f"Iteration {i} Notes", f"Iteration {i} Skipped")]
+               + ["Average (ms)", "Baseline (ms)", "Test Case Notes", "Steps", "Quip URL"])
+_CSV_EMPTY_ITERATION = ["", "", "No"] # Cells for a missing iteration
+
+def _csv_rows(session: Session):
+    """Yields one CSV row per test case."""
+    for tc in session.test_cases:
+        iterations = tc.iterations[:5]
+        row = [tc.name, tc.priority]
+        # One pass over the iterations fills their cells and accumulates the average
+        total = 0.0
+        count = 0
+        for iter_data in iterations:
+            time_ms = iter_data.time_ms
+            skipped = iter_data.skipped
+            if time_ms is None:
+                row.append("")
+            else:
+                row.append(time_ms)
+                if not skipped:
+                    total += time_ms
+                    count += 1
+            row.append(iter_data.notes)
+            row.append("Yes" if skipped else "No")
+        if len(iterations) < 5:
+            row.extend(_CSV_EMPTY_ITERATION * (5 - len(iterations)))
+
+        row.append(total / count if count else "") # Same as calculate_average()
+        row.append(tc.baseline_ms if tc.baseline_ms is not None else "")
+        row.append(tc.test_notes)
+        row.append("; ".join(tc.steps)) # Join steps into a single string
+        row.append(tc.quip_url)
+        yield row
+
 def export_session_to_csv(session: Session, filepath: str):
     """Exports session data to a CSV file."""
     try:
         with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
-
-            # Write header row
-            header = ["Test Case", "Priority"]
-            for i in range(1, 6):
-                header.append(f"Iteration {i} (ms)")
-                header.append(f"Iteration {i} Notes")
-                header.append(f"Iteration {i} Skipped")
-            header.extend(["Average (ms)", "Baseline (ms)", "Test Case Notes", "Steps", "Quip URL"])
-            writer.writerow(header)
-
-            # Write data rows
-            for tc in session.test_cases:
-                row = [tc.name, tc.priority]
-                for i in range(5):
-                    iter_data = tc.iterations[i] if i < len(tc.iterations) else Iteration()
-                    row.append(iter_data.time_ms if iter_data.time_ms is not None else "")
-                    row.append(iter_data.notes)
-                    row.append("Yes" if iter_data.skipped else "No")
-
-                average_ms = calculate_average(tc.iterations) # Need timer_utils here
-                row.append(average_ms if average_ms is not None else "")
-                row.append(tc.baseline_ms if tc.baseline_ms is not None else "")
-                row.append(tc.test_notes)
-                row.append("; ".join(tc.steps)) # Join steps into a single string
-                row.append(tc.quip_url)
-
-                writer.writerow(row)
-        print(f"Data exported successfully to {filepath}")
+            writer.writerow(_CSV_HEADER)
+            writer.writerows(_csv_rows(session))
+        log.debug("Data exported successfully to %s", filepath)
     except Exception as e:
-        print(f"Error exporting to CSV: {e}")
+        log.error("Error exporting to CSV: %s", e)
+        raise # Let the caller report the failure
 
 # Example Usage (for testing file manager)
 if __name__ == '__main__':
-    # Need a dummy calculate_average for this standalone test
-    def calculate_average(iterations):
-         valid_times = [iter.time_ms for iter in iterations if iter.time_ms is not None and not iter.skipped]
-         return sum(valid_times) / len(valid_times) if valid_times else None
-
     # Test loading templates
     p0_template = load_test_case_template("P0")
     print(f"\nLoaded {len(p0_template)} P0 test cases from template.")
@@ -181,7 +397,7 @@ if __name__ == '__main__':
 
     p1_template = load_test_case_template("P1")
     print(f"Loaded {len(p1_template)} P1 test cases from template.")
-     if p1_template:
+    if p1_template:
         print(f"First P1 case: {p1_template[0].name}")
 
 
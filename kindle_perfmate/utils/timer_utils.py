@@ -1,20 +1,49 @@
 # utils/timer_utils.py
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from .data_model import Iteration # Assuming they are in the same utils package
 
+_FORMAT_CACHE_MAX = 8192
+_format_cache: Dict[float, str] = {}
+
 def format_time(milliseconds: Optional[float]) -> str:
     """Formats milliseconds into a human-readable string (e.g., "1.234s" or "0.500s")."""
     if milliseconds is None:
         return "--"
-    seconds = milliseconds / 1000.0
-    return f"{seconds:.3f}s"
+    # UI refreshes format the same unchanged values over and over, so memoize
+    text = _format_cache.get(milliseconds)
+    if text is None:
+        if len(_format_cache) >= _FORMAT_CACHE_MAX:
+            _format_cache.clear()
+        seconds = milliseconds / 1000.0
+        text = _format_cache[milliseconds] = f"{seconds:.3f}s"
+    return text
+
+def format_time_batch(values: Iterable[Optional[float]]) -> List[str]:
+    """format_time for many values at once, also primes the format_time cache.
+
+    Each distinct value is formatted once, so a table full of repeated times
+    (or empty iterations) costs one format per unique number.
+    """
+    values = list(values)
+    missing = {v for v in values if v is not None and v not in _format_cache}
+    if len(_format_cache) + len(missing) > _FORMAT_CACHE_MAX:
+        _format_cache.clear()
+        missing = {v for v in values if v is not None}
+    _format_cache.update({v: f"{v / 1000.0:.3f}s" for v in missing})
+    get = _format_cache.get
+    return [get(v, "--") for v in values]
 
 def calculate_average(iterations: List[Iteration]) -> Optional[float]:
     """Calculates the average of valid iteration times."""
-    valid_times = [iter.time_ms for iter in iterations if iter.time_ms is not None and not iter.skipped]
-    if not valid_times:
-        return None
-    return sum(valid_times) / len(valid_times)
+    # Single pass without building an intermediate list
+    total = 0.0
+    count = 0
+    for iter in iterations:
+        time_ms = iter.time_ms
+        if time_ms is not None and not iter.skipped:
+            total += time_ms
+            count += 1
+    return total / count if count else None
 
 def calculate_spike(iteration_ms: Optional[float], baseline_ms: Optional[float], average_ms: Optional[float]) -> Optional[float]:
     """Calculates spike percentage relative to baseline or average."""
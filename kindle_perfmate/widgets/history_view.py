@@ -1,10 +1,15 @@
 # widgets/history_view.py
+import logging
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QListWidget,
-                             QPushButton, QHBoxLayout, QFileDialog)
-from PyQt5.QtCore import Qt, pyqtSignal
-from typing import List, Dict, Any
+                             QListWidgetItem, QPushButton, QHBoxLayout, QFileDialog)
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QFileSystemWatcher, QSignalBlocker
+from typing import List, Dict, Any, Optional
 
-from ..utils.file_manager import list_sessions # Assuming file_manager exists
+from ..utils.file_manager import list_sessions, sessions_dir_state, SessionList, SESSIONS_DIR # Assuming file_manager exists
+
+log = logging.getLogger(__name__)
+
+SESSION_DISPLAY_FMT = "Week: %s, Device: %s, Build: %s (%s)"
 
 class HistoryViewWidget(QWidget):
     """Widget to view and load past sessions."""
@@ -15,6 +20,13 @@ class HistoryViewWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.session_files_info: SessionList = SessionList()
+        self._dirty = True # Session list must be re-read from disk on next load
+        self._listed_state: frozenset = frozenset() # sessions_dir_state() the current list was read from
+
+        # Watch the sessions directory so the list is only re-read when it actually changed
+        self._sessions_watcher = QFileSystemWatcher([SESSIONS_DIR], self)
+
         self.setup_ui()
         self.connect_signals()
         self.load_session_list() # Load list when created
@@ -46,30 +58,54 @@ class HistoryViewWidget(QWidget):
         self.session_list_widget.itemSelectionChanged.connect(self.update_button_states)
         self.session_list_widget.itemDoubleClicked.connect(self.handle_double_click)
         self.load_button.clicked.connect(self.load_selected_session)
+        self._sessions_watcher.directoryChanged.connect(self._mark_dirty)
         # self.export_button.clicked.connect(self.export_selected_session) # Implement Export if needed here
 
+    @pyqtSlot(str)
+    def _mark_dirty(self, path: str):
+        """Marks the session list as stale when the sessions directory changes."""
+        # list_sessions() rewriting its index (and temp files) also fires this, only session files count
+        if not self._dirty and sessions_dir_state() != self._listed_state:
+            self._dirty = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_session_list() # No-op unless the sessions directory changed
+
     def load_session_list(self):
         """Clears the list and populates it with available sessions."""
-        self.session_list_widget.clear()
+        if not self._dirty and self.session_files_info:
+            return # Nothing changed on disk since the last load
+        self._dirty = False
+        self._listed_state = sessions_dir_state() # Taken first, so changes made while listing still count
         self.session_files_info = list_sessions() # Store the info dicts
 
-        if not self.session_files_info:
-            self.session_list_widget.addItem("No sessions found.")
-            return
-
-        for info in self.session_files_info:
-            # Format string for display
-            display_text = (f"Week: {info.get('week', 'N/A')}, "
-                            f"Device: {info.get('device', 'N/A')}, "
-                            f"Build: {info.get('build', 'N/A')} "
-                            f"({info.get('start_time', 'N/A').split('T')[0]})") # Show date
-            item = QListWidgetItem(display_text)
+        # Build all items up front so the widget is only touched in one batch
+        sessions = self.session_files_info
+        items = []
+        for index, (week, device, build, start_time) in enumerate(zip(sessions.weeks, sessions.devices,
+                                                                      sessions.builds, sessions.start_times)):
+            date = start_time[:start_time.find('T')] if 'T' in start_time else start_time # Show date
+            item = QListWidgetItem(SESSION_DISPLAY_FMT % (week, device, build, date))
             # Store the full info dictionary with the item
-            item.setData(Qt.UserRole, info)
-            self.session_list_widget.addItem(item)
+            item.setData(Qt.UserRole, sessions.row(index))
+            items.append(item)
+
+        # Suspend repaints and selection signals while the list is rebuilt
+        self.session_list_widget.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self.session_list_widget):
+                self.session_list_widget.clear()
+                if not items:
+                    self.session_list_widget.addItem("No sessions found.")
+                for item in items:
+                    self.session_list_widget.addItem(item)
+        finally:
+            self.session_list_widget.setUpdatesEnabled(True)
 
         self.update_button_states() # Update buttons based on the (initially empty) selection
 
+    @pyqtSlot()
     def update_button_states(self):
         """Enables/disables buttons based on whether an item is selected."""
         has_selection = len(self.session_list_widget.selectedItems()) > 0
@@ -86,22 +122,24 @@ class HistoryViewWidget(QWidget):
         return selected_items[0].data(Qt.UserRole)
 
 
+    @pyqtSlot(QListWidgetItem)
     def handle_double_click(self, item: QListWidgetItem):
          """Handle double-click to load the session."""
          self.load_selected_session()
 
+    @pyqtSlot()
     def load_selected_session(self):
         """Emits a signal requesting to load the selected session file."""
         info = self.get_selected_session_info()
         if info:
             filepath = info.get('filepath')
             if filepath:
-                 print(f"Load requested for: {filepath}")
+                 log.debug("Load requested for: %s", filepath)
                  self.load_session_requested.emit(filepath)
             else:
-                 print("Error: Could not get filepath for selected session.")
+                 log.error("Could not get filepath for selected session.")
         else:
-            print("No session selected to load.")
+            log.debug("No session selected to load.")
 
     # Optional: Add export functionality specific to the history view
     # def export_selected_session(self):
@@ -1,9 +1,13 @@
 # widgets/notes_search.py
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTextEdit,
                              QLineEdit, QHBoxLayout, QPushButton)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QSignalBlocker
 from typing import Optional
 
+NOTES_DEBOUNCE_MS = 500 # Wait this long after typing stops before emitting
+LONG_NOTES_DEBOUNCE_MS = 1500 # Longer wait once extracting the text gets expensive
+LONG_NOTES_THRESHOLD = 10000 # Characters
+
 class NotesSearchWidget(QWidget):
     """Widget for global notes and potential search functionality."""
 
@@ -13,15 +17,17 @@ class NotesSearchWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_ui()
-        self.connect_signals()
+        self._last_emitted = "" # Text sent with the last global_notes_changed
 
         # Timer for debouncing notes changes (don't emit signal on every keystroke)
         self._notes_timer = QTimer(self)
-        self._notes_timer.setInterval(500) # Wait 500ms after typing stops
+        self._notes_timer.setInterval(NOTES_DEBOUNCE_MS)
         self._notes_timer.setSingleShot(True)
         self._notes_timer.timeout.connect(self._emit_notes_changed)
 
+        self.setup_ui()
+        self.connect_signals()
+
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -57,18 +63,38 @@ class NotesSearchWidget(QWidget):
         # Connect search button (placeholder)
         # self.search_button.clicked.connect(self.perform_search) # Not implemented yet
 
+    @pyqtSlot()
     def _emit_notes_changed(self):
-         """Emits the global_notes_changed signal."""
-         self.global_notes_changed.emit(self.global_notes_edit.toPlainText())
+         """Emits the global_notes_changed signal if the text changed since the last emit."""
+         text = self.global_notes_edit.toPlainText()
+         if text == self._last_emitted:
+             return # e.g. a character typed and deleted again
+         self._last_emitted = text
+         self._notes_timer.setInterval(LONG_NOTES_DEBOUNCE_MS if len(text) > LONG_NOTES_THRESHOLD else NOTES_DEBOUNCE_MS)
+         self.global_notes_changed.emit(text)
          # print("Global notes signal emitted.") # Debugging
 
     @pyqtSlot(str)
     def set_global_notes(self, notes: str):
         """Sets the text of the global notes editor."""
         # Block signals to avoid emitting textChanged when setting the text programmatically
-        self.global_notes_edit.blockSignals(True)
-        self.global_notes_edit.setText(notes)
-        self.global_notes_edit.blockSignals(False)
+        with QSignalBlocker(self.global_notes_edit):
+            self.global_notes_edit.setText(notes)
+        self._last_emitted = self.global_notes_edit.toPlainText()
+
+    def take_pending_notes(self) -> Optional[str]:
+        """Returns the notes text if an edit is still waiting on the debounce timer, else None.
+
+        The pending emit is dropped, the caller applies the returned text itself.
+        """
+        if not self._notes_timer.isActive():
+            return None
+        self._notes_timer.stop()
+        text = self.global_notes_edit.toPlainText()
+        if text == self._last_emitted:
+            return None
+        self._last_emitted = text
+        return text
 
     def get_global_notes(self) -> str:
         """Gets the current text from the global notes editor."""
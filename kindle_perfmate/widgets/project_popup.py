@@ -1,7 +1,8 @@
 # widgets/project_popup.py
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLabel,
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QFormLayout,
                              QLineEdit, QDialogButtonBox, QComboBox)
-from PyQt5.QtCore import Qt
+
+from ..utils.data_model import PRIORITY_CHOICES
 
 class ProjectPopup(QDialog):
     """Dialog to capture new project/session details."""
@@ -20,7 +21,7 @@ class ProjectPopup(QDialog):
         self.build_input = QLineEdit()
         self.priority_combo = QComboBox()
         # Add typical priorities and the 'All' option
-        self.priority_combo.addItems(["All", "P0", "P1", "P2", "P3", "750"])
+        self.priority_combo.addItems(PRIORITY_CHOICES)
 
         self.form_layout.addRow("Week Number:", self.week_input)
         self.form_layout.addRow("Device Details:", self.device_input)
@@ -41,6 +42,14 @@ class ProjectPopup(QDialog):
         # self.build_input.setText("14.x.y.z")
 
 
+    def reset_fields(self):
+        """Empties the form for reuse, as a freshly created dialog would be."""
+        self.week_input.clear()
+        self.device_input.clear()
+        self.build_input.clear()
+        self.priority_combo.setCurrentIndex(0)
+        self.week_input.setFocus()
+
     def get_data(self) -> dict:
         """Returns the data entered in the form."""
         return {
@@ -1,33 +1,117 @@
 # widgets/stopwatch.py
+import logging
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QLineEdit, QTextEdit, QComboBox,
+                             QPushButton, QLineEdit, QComboBox,
                              QFormLayout, QFrame)
-from PyQt5.QtCore import Qt, QTimer, QElapsedTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import Qt, QBasicTimer, QElapsedTimer, QEvent, QSignalBlocker, QSize, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QPainter, QPalette, QStaticText, QTransform
 from typing import Optional
-from ..utils.data_model import Iteration, TestCase
-from ..utils.timer_utils import format_time
+from ..utils.data_model import Iteration, TestCase, PRIORITY_CHOICES
+
+log = logging.getLogger(__name__)
+
+_TICK_INTERVAL_MS = 33 # Display refresh, ~30 FPS, finer updates aren't visible anyway
+
+# Millisecond part of the display ("000s" .. "999s"), formatted once instead of every tick
+_MS_TEXT = tuple(f"{ms:03d}s" for ms in range(1000))
+
+# Info label texts, bound once
+_TC_LABEL_FMT = "Current Test Case: {}".format
+_ITERATION_LABEL_FMT = "Iteration: {} / 5".format
+_BASELINE_LABEL_FMT = "Baseline: {}".format
+_PRIORITY_LABEL_FMT = "Priority: {}".format
+_UNSET = object() # Compares unequal to any shown value, forces a label refresh
+
+
+class TimeDisplayWidget(QWidget):
+    """Paints the elapsed time ("1.234s") itself using cached QStaticText.
+
+    Cheaper than a QLabel: changing the value only schedules a repaint, there is
+    no setText/relayout, and the glyph layout of each text is computed once.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sec: int = 0
+        self._ms: int = 0
+        self._sec_text: Optional[QStaticText] = None # Rebuilt when the seconds change
+        self._ms_texts: dict[int, QStaticText] = {} # Millisecond part -> prepared text, filled lazily
+
+    def set_elapsed(self, milliseconds: int):
+        """Sets the displayed time, repainting only if the shown value changed."""
+        sec_part, ms_part = divmod(milliseconds, 1000)
+        if sec_part == self._sec and ms_part == self._ms:
+            return
+        if sec_part != self._sec:
+            self._sec = sec_part
+            self._sec_text = None
+        self._ms = ms_part
+        self.update() # Just schedules a paint, Qt coalesces repeated calls
+
+    def text(self) -> str:
+        """Returns the currently displayed text."""
+        return f"{self._sec}.{_MS_TEXT[self._ms]}"
+
+    def _static_text(self, text: str) -> QStaticText:
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.prepare(QTransform(), self.font()) # Measure/lay out glyphs up front
+        return static_text
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            # Cached layouts were prepared for the old font
+            self._sec_text = None
+            self._ms_texts.clear()
+            self.updateGeometry()
+        super().changeEvent(event)
+
+    def sizeHint(self) -> QSize:
+        metrics = self.fontMetrics()
+        return QSize(metrics.horizontalAdvance("00.000s"), metrics.height())
+
+    def paintEvent(self, event):
+        if self._sec_text is None:
+            self._sec_text = self._static_text(f"{self._sec}.")
+        ms_text = self._ms_texts.get(self._ms)
+        if ms_text is None:
+            ms_text = self._ms_texts[self._ms] = self._static_text(_MS_TEXT[self._ms])
+
+        sec_size = self._sec_text.size()
+        ms_size = ms_text.size()
+        x = (self.width() - sec_size.width() - ms_size.width()) / 2
+        y = (self.height() - sec_size.height()) / 2
+
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        painter.setPen(self.palette().color(QPalette.WindowText))
+        painter.drawStaticText(int(x), int(y), self._sec_text)
+        painter.drawStaticText(int(x + sec_size.width()), int(y), ms_text)
+        painter.end()
 
 class StopwatchWidget(QWidget):
     """Widget containing the stopwatch, controls, and iteration inputs."""
 
     # Signal emitted when an iteration is confirmed
-    # Emits: current_test_case_index (int), iteration_index (int), iteration_data (Iteration)
-    iteration_saved = pyqtSignal(int, int, Iteration)
+    # Emits: current_test_case_index (int), iteration_index (int)
+    # The Iteration itself is updated in place on the shared TestCase, receivers read it from there
+    iteration_saved = pyqtSignal(int, int)
     # Signal emitted when the priority filter dropdown changes
     priority_filter_changed = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.timer = QTimer(self)
+        self._tick = QBasicTimer() # Display refresh, delivered to timerEvent (no signal/slot hop)
         self.elapsed_timer = QElapsedTimer()
         self.is_running = False
-        self._elapsed_ms: float = 0.0
+        self._frozen_ms: int = 0 # Elapsed time captured at the last stop, elapsed_timer is the live source
 
         # We need to know which test case row and iteration we are currently on
         self._current_test_case_index: int = -1
         self._current_iteration_index: int = 0 # Iterations 0 to 4
 
-        self._test_cases: list[TestCase] = [] # Reference to the list of test cases
+        self._current_tc: Optional[TestCase] = None # Test case currently selected in the table
+        self._last_info: Optional[tuple] = () # (name, iteration, baseline_ms, priority) shown in the info labels, None when cleared
 
         self.setup_ui()
         self.connect_signals()
@@ -38,9 +122,11 @@ class StopwatchWidget(QWidget):
         self.setLayout(layout)
 
         # Timer Display
-        self.time_display = QLabel("00:00.000")
-        self.time_display.setAlignment(Qt.AlignCenter)
-        self.time_display.setStyleSheet("font-size: 60px; font-weight: bold;")
+        self.time_display = TimeDisplayWidget()
+        font = self.time_display.font()
+        font.setPixelSize(60)
+        font.setBold(True)
+        self.time_display.setFont(font) # Plain QFont, no style sheet to parse/polish
         layout.addWidget(self.time_display)
 
         # Controls
@@ -79,7 +165,7 @@ class StopwatchWidget(QWidget):
         self.iteration_notes_input = QLineEdit()
         self.baseline_input = QLineEdit() # For entering/overriding baseline if needed manually
         self.priority_filter_combo = QComboBox() # This is the GLOBAL filter for the table
-        self.priority_filter_combo.addItems(["All", "P0", "P1", "P2", "P3", "750"])
+        self.priority_filter_combo.addItems(PRIORITY_CHOICES)
         self.priority_filter_combo.setCurrentText("All") # Default filter
 
 
@@ -93,14 +179,11 @@ class StopwatchWidget(QWidget):
         filter_layout.addStretch() # Push combo to the left
         layout.addLayout(filter_layout) # Add filter combo outside the frame
 
-
-        # Add iteration notes input to the main layout for now, simpler structure
-        layout.addRow(QLabel("Iteration Notes:"), self.iteration_notes_input)
+        layout.addWidget(input_frame) # Iteration notes row lives in the frame's form layout
 
         layout.addStretch() # Push everything to the top
 
     def connect_signals(self):
-        self.timer.timeout.connect(self.update_time)
         self.start_stop_button.toggled.connect(self.toggle_timer)
         self.reset_button.clicked.connect(self.reset_timer)
         self.confirm_next_button.clicked.connect(self.confirm_and_next)
@@ -110,6 +193,7 @@ class StopwatchWidget(QWidget):
         # Need to handle this in the main window or application event filter
         # For now, we'll rely on button clicks.
 
+    @pyqtSlot(bool)
     def toggle_timer(self, checked):
         if checked: # Button is checked (Start)
             self.start_timer()
@@ -119,56 +203,76 @@ class StopwatchWidget(QWidget):
     def start_timer(self):
         if not self.is_running:
             self.elapsed_timer.restart()
-            self.timer.start(10) # Update every 10ms
+            if self.isVisible():
+                self._tick.start(_TICK_INTERVAL_MS, Qt.PreciseTimer, self)
             self.is_running = True
-            self.start_stop_button.setText("Stop")
-            self.start_stop_button.setChecked(True)
+            # Sync the button without re-entering toggle_timer through toggled()
+            with QSignalBlocker(self.start_stop_button):
+                self.start_stop_button.setText("Stop")
+                self.start_stop_button.setChecked(True)
             self.reset_button.setEnabled(True)
-            print("Stopwatch started")
+            log.debug("Stopwatch started")
 
     def stop_timer(self):
         if self.is_running:
-            self.timer.stop()
-            self._elapsed_ms = self.elapsed_timer.elapsed() # Get final elapsed time
+            self._tick.stop()
+            self._frozen_ms = self.elapsed_timer.elapsed() # Get final elapsed time
+            self.update_display(self._frozen_ms) # Show the recorded value, not the last tick's
             self.is_running = False
-            self.start_stop_button.setText("Start")
-            self.start_stop_button.setChecked(False) # Ensure it's unchecked visually
-            print(f"Stopwatch stopped at {format_time(self._elapsed_ms)}")
+            with QSignalBlocker(self.start_stop_button):
+                self.start_stop_button.setText("Start")
+                self.start_stop_button.setChecked(False) # Ensure it's unchecked visually
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Stopwatch stopped at %.3fs", self._frozen_ms / 1000.0)
 
+    @pyqtSlot()
     def reset_timer(self):
         self.stop_timer() # Ensure timer is stopped
-        self._elapsed_ms = 0.0
-        self.update_display(self._elapsed_ms)
+        self._frozen_ms = 0
+        self.update_display(0)
         self.reset_button.setEnabled(False)
-        print("Stopwatch reset")
+        log.debug("Stopwatch reset")
 
 
+    def hideEvent(self, event):
+        # Nobody can see the display, stop refreshing it. Only the tick is paused,
+        # elapsed_timer keeps measuring so a running iteration isn't affected.
+        self._tick.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.is_running:
+            self.update_display(self.elapsed_timer.elapsed())
+            self._tick.start(_TICK_INTERVAL_MS, Qt.PreciseTimer, self)
+
+    def timerEvent(self, event):
+        if event.timerId() == self._tick.timerId():
+            self.update_time()
+        else:
+            super().timerEvent(event)
+
     def update_time(self):
         """Updates the displayed time."""
-        if self.is_running:
-            self._elapsed_ms = self.elapsed_timer.elapsed()
-            self.update_display(self._elapsed_ms)
+        if not self.is_running:
+            return # Stray tick after stop
+        self.update_display(self.elapsed_timer.elapsed())
 
-    def update_display(self, milliseconds: float):
-        """Formats and displays the time."""
-        self.time_display.setText(format_time(milliseconds))
+    def update_display(self, milliseconds: int):
+        """Displays the time (same format as format_time, e.g. "1.234s")."""
+        self.time_display.set_elapsed(milliseconds)
 
+    @pyqtSlot()
     def confirm_and_next(self):
         """Confirms the current time, saves iteration, and moves to the next."""
-        if self._current_test_case_index == -1 or not self._test_cases:
-            print("No test case selected or loaded.")
+        current_tc = self._current_tc
+        if current_tc is None or self._current_test_case_index == -1:
+            log.debug("No test case selected or loaded.")
             return
 
-        # Get the current test case object from the list
-        if self._current_test_case_index >= len(self._test_cases):
-             print(f"Error: Invalid current test case index {self._current_test_case_index}")
-             return
-
-        current_tc = self._test_cases[self._current_test_case_index]
-
         # Check if we are within the 5 iterations limit
         if self._current_iteration_index >= 5:
-            print(f"Test Case '{current_tc.name}' already has 5 iterations. Cannot add more.")
+            log.debug("Test Case '%s' already has 5 iterations. Cannot add more.", current_tc.name)
             # Optionally, move to the next test case even if iterations are full
             self.move_to_next_test_case()
             return
@@ -177,8 +281,12 @@ class StopwatchWidget(QWidget):
         self.stop_timer()
 
         # 2. Get data
-        iteration_time = self._elapsed_ms # Time is already captured by stop_timer
+        iteration_time = self._frozen_ms # Time is already captured by stop_timer
         iteration_notes = self.iteration_notes_input.text().strip()
+        if iteration_time == 0 and not iteration_notes:
+            # Stray click without a run, don't record an empty 0.000s iteration
+            log.debug("Nothing timed for '%s', iteration not saved.", current_tc.name)
+            return
         # Skipped state would need a checkbox
 
         # 3. Create or update the iteration data object
@@ -191,14 +299,11 @@ class StopwatchWidget(QWidget):
         current_tc.iterations[self._current_iteration_index].notes = iteration_notes
         current_tc.iterations[self._current_iteration_index].skipped = False # Assuming Confirm is not skipped
 
-        print(f"Confirmed iteration {self._current_iteration_index + 1} for '{current_tc.name}' with time {format_time(iteration_time)}")
+        log.debug("Confirmed iteration %d for '%s' with time %.3fs",
+                  self._current_iteration_index + 1, current_tc.name, iteration_time / 1000.0)
 
         # 4. Emit signal to update the table
-        self.iteration_saved.emit(
-             self._current_test_case_index,
-             self._current_iteration_index,
-             current_tc.iterations[self._current_iteration_index] # Pass the updated iteration object
-        )
+        self.iteration_saved.emit(self._current_test_case_index, self._current_iteration_index)
 
         # 5. Reset stopwatch and inputs for the next iteration
         self.reset_timer()
@@ -210,7 +315,7 @@ class StopwatchWidget(QWidget):
 
         # If we finished all 5 iterations for the current TC, move to the next TC
         if self._current_iteration_index >= 5:
-            print(f"Finished 5 iterations for '{current_tc.name}'. Moving to next test case.")
+            log.debug("Finished 5 iterations for '%s'. Moving to next test case.", current_tc.name)
             self.move_to_next_test_case()
         else:
             # Still more iterations for the current TC
@@ -218,79 +323,67 @@ class StopwatchWidget(QWidget):
 
     def move_to_next_test_case(self):
         """Advances the currently active test case in the list."""
-        next_index = -1
-        # Find the index of the current TC object in the possibly filtered list
-        try:
-            # Need a way to find the *next visible* row in the table if filtering is applied.
-            # This requires interaction with the TestTableWidget.
-            # For now, let's just increment the index in the *full* list of test cases.
-            # This might select a hidden row if filtering is active.
-            # A better approach is to ask the TestTableWidget for the index of the next *visible* row.
-            # Let's emit a signal asking the main window/table to advance.
-            print("Requesting move to next test case via signal...")
-            # We need a signal from here, or better, a slot that's called by the table when selection changes.
-            # Let's rely on an external mechanism (like the table's selection change) to update us.
-            # For now, we'll just reset internal state and wait for the table to tell us what's next.
-            self._current_test_case_index = -1 # Invalidate current index
-            self._current_iteration_index = 0 # Reset iteration counter for the new case
-            self.update_current_info_display()
-            # The TestTableWidget should listen for the end of 5 iterations and advance its selection.
-            # When its selection changes, it calls `update_current_test_case_info`.
-
-        except Exception as e:
-            print(f"Error moving to next test case: {e}")
-            # If we can't find the next, just reset state
-            self._current_test_case_index = -1
-            self._current_iteration_index = 0
-            self.update_current_info_display()
-
+        # The stopwatch can't pick the next *visible* row itself (the table owns filtering),
+        # so reset our state and wait for the table's selection change to call
+        # `update_current_test_case_info` with the next test case.
+        log.debug("Requesting move to next test case via signal...")
+        self._current_test_case_index = -1 # Invalidate current index
+        self._current_tc = None
+        self._current_iteration_index = 0 # Reset iteration counter for the new case
+        self.update_current_info_display()
 
     @pyqtSlot(int, TestCase, int)
     def update_current_test_case_info(self, row_index: int, test_case: TestCase, first_empty_iteration_index: int):
         """Slot to update the stopwatch widget based on the currently selected test case in the table."""
+        # row_index is the table row (in the filtered view), it's what iteration_saved reports back.
+        # The table emits row -1 with an empty TestCase when nothing is selected.
         self._current_test_case_index = row_index
-        self._test_cases = [test_case] # Store just the current TC or pass the whole list?
-                                      # Storing the whole list might be better if move_to_next_test_case
-                                      # needs to know about other TCs. Let's update TestTable to pass the list.
-        # Assume the TestTableWidget passes the *entire* list of test cases it's displaying (filtered or not)
-        # And the *index* of the currently selected row *within that list*.
-        # Let's refine the signal: `current_test_case_changed(list_of_test_cases, selected_index_in_list, first_empty_iteration)`
-        # This requires a change in TestTableWidget. For now, simulate:
-        self._test_cases = [test_case] # Just hold the one TC for display purposes
-        self._current_test_case_index = 0 # Index within *this* temp list is 0
+        self._current_tc = test_case if row_index != -1 else None
         self._current_iteration_index = first_empty_iteration_index # Tell stopwatch which iter to start at
 
         self.update_current_info_display()
-        print(f"Stopwatch updated for TC: '{test_case.name}', starting iteration: {first_empty_iteration_index + 1}")
+        log.debug("Stopwatch updated for TC: '%s', starting iteration: %d", test_case.name, first_empty_iteration_index + 1)
 
 
     def update_current_info_display(self):
         """Updates labels showing current TC name, iteration, baseline, priority."""
-        if self._test_cases and self._current_test_case_index != -1 and self._current_test_case_index < len(self._test_cases):
-            tc = self._test_cases[self._current_test_case_index]
-            self.current_test_case_label.setText(f"Current Test Case: {tc.name}")
+        tc = self._current_tc
+        if tc is not None:
             # Display current iteration (1-based index) and total (5)
-            self.current_iteration_label.setText(f"Iteration: {min(self._current_iteration_index, 5) + 1} / 5")
-            self.current_baseline_label.setText(f"Baseline: {format_time(tc.baseline_ms)}")
-            self.current_priority_label.setText(f"Priority: {tc.priority}")
+            info = (tc.name, min(self._current_iteration_index, 5) + 1, tc.baseline_ms, tc.priority)
+            if info != self._last_info:
+                # Only touch labels whose value changed, each setText re-lays out the label
+                old = self._last_info or (_UNSET,) * 4
+                name, iteration, baseline_ms, priority = info
+                if name != old[0]:
+                    self.current_test_case_label.setText(_TC_LABEL_FMT(name))
+                if iteration != old[1]:
+                    self.current_iteration_label.setText(_ITERATION_LABEL_FMT(iteration))
+                if baseline_ms != old[2]:
+                    self.current_baseline_label.setText(_BASELINE_LABEL_FMT(tc.baseline_ms_fmt))
+                if priority != old[3]:
+                    self.current_priority_label.setText(_PRIORITY_LABEL_FMT(priority))
+                self._last_info = info
             # Pre-fill notes if there are any for the current iteration
             if self._current_iteration_index < len(tc.iterations):
                  self.iteration_notes_input.setText(tc.iterations[self._current_iteration_index].notes)
             else:
                  self.iteration_notes_input.clear()
         else:
-            self.current_test_case_label.setText("Current Test Case: --")
-            self.current_iteration_label.setText("Iteration: -- / --")
-            self.current_baseline_label.setText("Baseline: --")
-            self.current_priority_label.setText("Priority: --")
+            if self._last_info is not None:
+                self.current_test_case_label.setText("Current Test Case: --")
+                self.current_iteration_label.setText("Iteration: -- / --")
+                self.current_baseline_label.setText("Baseline: --")
+                self.current_priority_label.setText("Priority: --")
+                self._last_info = None
             self.iteration_notes_input.clear()
 
-    # Add a method to handle the spacebar press (called from main window's event filter)
+    # Add a method to handle the spacebar press (called from the main window's Space shortcut)
     @pyqtSlot()
     def handle_spacebar_press(self):
         """Handles the spacebar shortcut to toggle the timer."""
         self.start_stop_button.toggle()
-        print("Spacebar pressed (toggle timer)")
+        log.debug("Spacebar pressed (toggle timer)")
 
 
 # Example Usage (for testing stopwatch widget)
@@ -311,16 +404,14 @@ if __name__ == '__main__':
              """Simulates getting data for the current row from the table."""
              if not self.test_cases: return -1, None, 0
              tc = self.test_cases[self._current_row]
-             # Find the first empty iteration index
-             first_empty_iter = next((i for i, iter in enumerate(tc.iterations) if iter.time_ms is None), len(tc.iterations))
-             return self._current_row, tc, first_empty_iter
+             return self._current_row, tc, tc.first_empty_iter
 
-        def save_iteration(self, row_index, iter_index, iter_data):
-             """Simulates saving data back to the table's data source."""
-             print(f"MockTable: Received save data for row {row_index}, iter {iter_index}: {iter_data.time_ms}ms")
+        def save_iteration(self, row_index, iter_index):
+             """Simulates the table reacting to a saved iteration (the TestCase is shared, already updated)."""
              if row_index < len(self.test_cases) and iter_index < len(self.test_cases[row_index].iterations):
-                 self.test_cases[row_index].iterations[iter_index] = iter_data
-                 print("MockTable: Data updated internally.")
+                 iter_data = self.test_cases[row_index].iterations[iter_index]
+                 self.test_cases[row_index].iteration_changed(iter_index)
+                 print(f"MockTable: Received save for row {row_index}, iter {iter_index}: {iter_data.time_ms}ms")
                  # Simulate advancing row if 5 iterations are done
                  if iter_index == 4: # 0-indexed, so index 4 is the 5th iteration
                       self._current_row = (self._current_row + 1) % len(self.test_cases)
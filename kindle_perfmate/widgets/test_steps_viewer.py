@@ -1,6 +1,6 @@
 # widgets/test_steps_viewer.py
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTextEdit,
-                             QListWidget, QListWidgetItem, QFrame, QSizePolicy)
+                             QFrame, QSizePolicy)
 from PyQt5.QtCore import Qt, pyqtSlot
 from typing import Optional
 
@@ -11,6 +11,7 @@ class TestStepsViewerWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_test_case: Optional[TestCase] = None
+        self._shown_steps: Optional[list[str]] = None # Steps currently shown in steps_list, None for placeholder text
         self.setup_ui()
 
     def setup_ui(self):
@@ -18,7 +19,10 @@ class TestStepsViewerWidget(QWidget):
         self.setLayout(layout)
 
         self.name_label = QLabel("Select a Test Case")
-        self.name_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        font = self.name_label.font()
+        font.setPixelSize(18)
+        font.setBold(True)
+        self.name_label.setFont(font) # Plain QFont, no style sheet to parse/polish
         layout.addWidget(self.name_label)
 
         # Frame for details
@@ -43,8 +47,12 @@ class TestStepsViewerWidget(QWidget):
         steps_label = QLabel("Steps:")
         layout.addWidget(steps_label)
 
-        self.steps_list = QListWidget()
-        self.steps_list.setSelectionMode(QListWidget.NoSelection) # Not selectable
+        # A plain label, the steps are read-only text so an item view is overkill
+        self.steps_list = QLabel()
+        self.steps_list.setTextFormat(Qt.PlainText)
+        self.steps_list.setWordWrap(True)
+        self.steps_list.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.steps_list.setTextInteractionFlags(Qt.TextSelectableByMouse)
         self.steps_list.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         layout.addWidget(self.steps_list)
 
@@ -61,25 +69,27 @@ class TestStepsViewerWidget(QWidget):
     @pyqtSlot(int, TestCase, int) # Slot receives same signal as stopwatch
     def update_test_case_info(self, row_index: int, test_case: TestCase, first_empty_iteration: int):
         """Updates the viewer with details of the selected test case."""
+        if test_case is self.current_test_case and test_case and test_case.name:
+            # Same test case re-emitted, only what the table can edit (baseline, notes) may have changed
+            self.baseline_label.setText(f"Baseline: {test_case.baseline_ms_fmt}")
+            if test_case.test_notes != self.notes_viewer.toPlainText():
+                self.notes_viewer.setText(test_case.test_notes)
+            return
         self.current_test_case = test_case
 
         if test_case and test_case.name: # Check if it's a valid TC object
             self.name_label.setText(test_case.name)
-            self.baseline_label.setText(f"Baseline: {test_case.baseline_ms if test_case.baseline_ms is not None else '--'} ms")
+            self.baseline_label.setText(f"Baseline: {test_case.baseline_ms_fmt}")
             self.priority_label.setText(f"Priority: {test_case.priority}")
             # Display Quip URL as a clickable link if available
-            if test_case.quip_url:
-                 self.quip_label.setText(f'Quip URL: <a href="{test_case.quip_url}">{test_case.quip_url}</a>')
-            else:
-                 self.quip_label.setText("Quip URL: --")
+            self.quip_label.setText(test_case.quip_html)
 
 
-            self.steps_list.clear()
-            if test_case.steps:
-                for i, step in enumerate(test_case.steps):
-                    self.steps_list.addItem(f"{i+1}. {step}")
-            else:
-                 self.steps_list.addItem("No steps defined.")
+            # The table re-emits the same selection often, only re-set the text if the steps differ
+            if test_case.steps != self._shown_steps:
+                self.steps_list.setText("\n".join(f"{i+1}. {step}" for i, step in enumerate(test_case.steps))
+                                        or "No steps defined.")
+                self._shown_steps = list(test_case.steps)
 
             self.notes_viewer.setText(test_case.test_notes)
 
@@ -88,16 +98,16 @@ class TestStepsViewerWidget(QWidget):
             self.baseline_label.setText("Baseline: --")
             self.priority_label.setText("Priority: --")
             self.quip_label.setText("Quip URL: --")
-            self.steps_list.clear()
-            self.steps_list.addItem("Select a test case from the table to view steps.")
+            self.steps_list.setText("Select a test case from the table to view steps.")
+            self._shown_steps = None
             self.notes_viewer.clear()
 
 
 # Example Usage
 if __name__ == '__main__':
     from PyQt5.QtWidgets import QApplication, QMainWindow
+    from PyQt5.QtCore import QTimer
     import sys
-    from ..utils.data_model import TestCase # Assuming ..utils exists
 
     app = QApplication(sys.argv)
 
@@ -1,22 +1,231 @@
 # widgets/test_table.py
-from PyQt5.QtWidgets import (QTableWidget, QTableWidgetItem, QHeaderView,
-                             QAbstractItemView, QMenu, QApplication, QAction)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+import logging
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QAbstractTableModel, QModelIndex, QItemSelectionModel
 from PyQt5.QtGui import QColor
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..utils.data_model import Session, TestCase, Iteration
-from ..utils.timer_utils import format_time, calculate_average, calculate_spike
+from ..utils.timer_utils import format_time, format_time_batch, calculate_average, calculate_spike
+
+log = logging.getLogger(__name__)
+
+try:
+    import numpy as np # Optional: classifies the whole table at once when a filter is applied
+except ImportError:
+    np = None # Rows are classified one by one on first paint instead
 
 # Define colors for spike highlighting (adjust as needed)
 SPIKE_COLOR_MINOR = QColor(255, 255, 150) # Light Yellow (e.g., 10-20% over baseline/avg)
 SPIKE_COLOR_MAJOR = QColor(255, 150, 150) # Light Red (e.g., > 20% over baseline/avg)
+SKIPPED_COLOR = QColor(200, 200, 200) # Grey out skipped
 SPIKE_THRESHOLD_MINOR = 10 # % over baseline/average
 SPIKE_THRESHOLD_MAJOR = 20 # % over baseline/average
 
+# Per-iteration highlight categories, cached per row by the model
+SPIKE_NONE, SPIKE_MINOR, SPIKE_MAJOR, ITER_SKIPPED = range(4)
+# Background per category, None leaves the view's own (palette) background
+_CATEGORY_BACKGROUNDS = (None, SPIKE_COLOR_MINOR, SPIKE_COLOR_MAJOR, SKIPPED_COLOR)
+_TIME_ROLES = (Qt.DisplayRole, Qt.BackgroundRole) # What changes in the time cells when an iteration/baseline changes
+_DATA_ROLES = frozenset((Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole, Qt.UserRole)) # Roles data() answers
+FETCH_PAGE_SIZE = 50 # Rows handed to the view at a time, more are fetched as it scrolls
+
+
+def _batch_row_stats(test_cases: List[TestCase]) -> Dict[int, tuple]:
+    """Vectorized TestCaseTableModel._stats for a whole list, needs numpy.
+
+    Same rules as calculate_average/calculate_spike: skipped and empty iterations
+    don't count towards the average, spikes compare against the baseline if it's
+    positive, else against the average.
+    """
+    # Only the regular 5-iteration rows, odd ones are left to the per-row path
+    test_cases = [tc for tc in test_cases if len(tc.iterations) == 5]
+    if not test_cases:
+        return {}
+    rows = [tc.iterations for tc in test_cases]
+    # Flat comprehensions + reshape, numpy turns None into nan for float arrays
+    times = np.array([it.time_ms for iters in rows for it in iters], dtype=float).reshape(-1, 5)
+    skipped = np.array([it.skipped for iters in rows for it in iters], dtype=bool).reshape(-1, 5)
+    baselines = np.array([tc.baseline_ms for tc in test_cases], dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        counted = ~np.isnan(times) & ~skipped
+        counts = counted.sum(axis=1)
+        averages = np.where(counted, times, 0.0).sum(axis=1) / counts # nan where nothing counted
+        ref = np.where(baselines > 0, baselines, np.where(averages > 0, averages, np.nan))[:, None]
+        pct = np.where(times > 0, (times - ref) / ref * 100, np.nan)
+        categories = (pct >= SPIKE_THRESHOLD_MINOR).astype(np.int8) + (pct >= SPIKE_THRESHOLD_MAJOR)
+    categories[skipped] = ITER_SKIPPED
+
+    return {
+        id(tc): (None if avg != avg else avg, tuple(cats)) # avg != avg: nan, nothing counted
+        for tc, avg, cats in zip(test_cases, averages.tolist(), categories.tolist())
+    }
+
+# Columns: TC Name, Iter1..Iter5, Average, Baseline, TC Notes
+# (Steps, Priority and Quip URL are shown by other widgets straight from the TestCase)
+TABLE_HEADERS = (
+    "Test Case",
+    "Iter 1", "Iter 2", "Iter 3", "Iter 4", "Iter 5",
+    "Average", "Baseline", "Notes", # Test Case Notes
+)
+COL_NAME, COL_ITER1, COL_ITER2, COL_ITER3, COL_ITER4, COL_ITER5, COL_AVG, COL_BASELINE, COL_NOTES = range(len(TABLE_HEADERS))
+
+
+class TestCaseTableModel(QAbstractTableModel):
+    """Table model over the (filtered) list of TestCases.
+
+    Nothing is copied into per-cell items, the view asks data() for the cells it
+    actually paints and the values are read straight from the TestCase objects.
+    """
+
+    # Signal emitted when the user commits an edit (Notes, Baseline) in the view
+    # Emits: row_index (int), col_index (int), entered_text (str)
+    cell_edited = pyqtSignal(int, int, str)
 
-class TestTableWidget(QTableWidget):
-    """Table widget to display and manage test cases and iterations."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._test_cases: List[TestCase] = []
+        self._loaded = 0 # Rows exposed to the view so far (see canFetchMore/fetchMore)
+        # id(TestCase) -> (average_ms, (category,) * 5), computed on first paint of the row
+        self._row_stats: Dict[int, tuple] = {}
+        # Row template: one display getter per column, indexed by data() instead of an if-chain
+        self._display_getters = (
+            lambda tc: tc.name,
+            *(lambda tc, i=i: format_time(self._iteration_time(tc, i)) for i in range(5)),
+            lambda tc: format_time(self._stats(tc)[0]),
+            lambda tc: tc.baseline_ms_fmt,
+            lambda tc: tc.test_notes,
+        )
+
+    def set_test_cases(self, test_cases: List[TestCase]):
+        """Replaces the displayed list (the list is referenced, not copied)."""
+        self.beginResetModel()
+        self._test_cases = test_cases
+        self._loaded = min(len(test_cases), FETCH_PAGE_SIZE)
+        self._row_stats = _batch_row_stats(test_cases) if np is not None and test_cases else {}
+        self._prime_time_formats(0, self._loaded)
+        self.endResetModel()
+
+    def _prime_time_formats(self, first: int, end: int):
+        """Formats the times of rows [first, end) in one batch so painting them only hits the cache."""
+        row_stats = self._row_stats
+        values = []
+        for tc in self._test_cases[first:end]:
+            values.extend(iter_data.time_ms for iter_data in tc.iterations[:5])
+            stats = row_stats.get(id(tc))
+            if stats is not None:
+                values.append(stats[0]) # Average, when already computed
+        if values:
+            format_time_batch(values)
+
+    def invalidate_row(self, row: int):
+        """Drops the cached average/spike categories of a row, call after iteration or baseline edits."""
+        self._row_stats.pop(id(self._test_cases[row]), None)
+
+    def _stats(self, tc: TestCase) -> tuple:
+        """Returns (average_ms, spike categories of the 5 iterations), cached per test case."""
+        stats = self._row_stats.get(id(tc))
+        if stats is None:
+            average_ms = calculate_average(tc.iterations)
+            categories = []
+            for iter_data in tc.iterations[:5]:
+                if iter_data.skipped:
+                    categories.append(ITER_SKIPPED) # No spike calculation for skipped
+                    continue
+                spike_pct = calculate_spike(iter_data.time_ms, tc.baseline_ms, average_ms) # Use baseline first, then average
+                if spike_pct is None or spike_pct < SPIKE_THRESHOLD_MINOR:
+                    categories.append(SPIKE_NONE)
+                elif spike_pct >= SPIKE_THRESHOLD_MAJOR:
+                    categories.append(SPIKE_MAJOR)
+                else:
+                    categories.append(SPIKE_MINOR)
+            categories += [SPIKE_NONE] * (5 - len(categories)) # Short (old/hand-built) iteration lists
+            stats = self._row_stats[id(tc)] = (average_ms, tuple(categories))
+        return stats
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._test_cases)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        end = min(self._loaded + FETCH_PAGE_SIZE, len(self._test_cases))
+        if end > self._loaded:
+            self._prime_time_formats(self._loaded, end)
+            self.beginInsertRows(QModelIndex(), self._loaded, end - 1)
+            self._loaded = end
+            self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(TABLE_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return TABLE_HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in (COL_BASELINE, COL_NOTES): # Baseline and Notes are editable, times/average are not
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        # The view also asks for font, alignment, decoration... roles, bail out before any lookup
+        if role not in _DATA_ROLES or not index.isValid():
+            return None
+        tc = self._test_cases[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self._display_getters[column](tc)
+        elif role == Qt.BackgroundRole:
+            if COL_ITER1 <= column <= COL_ITER5:
+                return self._iteration_background(tc, column - COL_ITER1)
+        elif role == Qt.UserRole: # Actual numeric values behind the formatted cells
+            if COL_ITER1 <= column <= COL_ITER5:
+                return self._iteration_time(tc, column - COL_ITER1)
+            if column == COL_AVG:
+                return self._stats(tc)[0]
+            if column == COL_BASELINE:
+                return tc.baseline_ms
+        return None
+
+    @staticmethod
+    def _iteration_time(tc: TestCase, iteration_index: int) -> Optional[float]:
+        iterations = tc.iterations
+        return iterations[iteration_index].time_ms if iteration_index < len(iterations) else None
+
+    def _iteration_background(self, tc: TestCase, iteration_index: int) -> Optional[QColor]:
+        """Spike highlighting for an iteration cell, None for the default background."""
+        return _CATEGORY_BACKGROUNDS[self._stats(tc)[1][iteration_index]]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or not (self.flags(index) & Qt.ItemIsEditable):
+            return False
+        text = str(value)
+        if text == self._display_getters[index.column()](self._test_cases[index.row()]):
+            return False # Editor closed without a change, nothing to parse or mark unsaved
+        # Parsing/validating is up to the table widget, which also knows the session
+        self.cell_edited.emit(index.row(), index.column(), text)
+        return True
+
+    def refresh_cells(self, row: int, first_column: int, last_column: int, roles=()):
+        """Tells the view that cells of a row changed (values are re-read from the TestCase).
+
+        roles narrows what the view re-reads, empty means every role.
+        """
+        if row >= self._loaded:
+            return # Not fetched by the view yet, it reads fresh values when it gets there
+        self.dataChanged.emit(self.index(row, first_column), self.index(row, last_column), list(roles))
+
+
+class TestTableWidget(QTableView):
+    """Table view to display and manage test cases and iterations."""
 
     # Signal emitted when the current test case selection changes
     # Emits: selected_row_index (int), test_case_data (TestCase), first_empty_iteration_index (int)
@@ -30,65 +239,87 @@ class TestTableWidget(QTableWidget):
         self.session_data: Optional[Session] = None # Reference to the main session data
         self.filtered_test_cases: List[TestCase] = [] # The list currently displayed (after filter)
         self._current_filter = "All" # Store the active filter string
+        self._tc_to_orig_index: Dict[int, int] = {} # id(TestCase) -> index in session_data.test_cases
+        self._last_emitted_row = -2 # Row last sent via current_test_case_changed (-2: nothing sent for this list)
+        self._populating = False # Set while the model is being reset, selection churn is ignored
+        self._last_filter_sig = (None, None, None) # (priority, id(session), test case count) currently displayed
+
+        # Selection changes arrive in bursts (reset, clear, select), coalesce them into one
+        # handle_selection_change on the next event loop pass
+        self._sel_timer = QTimer(self)
+        self._sel_timer.setSingleShot(True)
+        self._sel_timer.setInterval(0)
+
+        self._model = TestCaseTableModel(self)
+        self.setModel(self._model)
 
         self.setup_ui()
         self.connect_signals()
 
     def setup_ui(self):
-        # Define columns: TC Name, Iter1..Iter5, Average, Baseline, TC Notes, Steps, Priority, Quip URL
-        # Hide Steps, Priority, Quip URL columns in the table view initially, use other widgets to show
-        self.setColumnCount(5 + 1 + 1 + 1 + 3) # 5 iters, Avg, Base, TC Notes, Steps, Priority, Quip
-        headers = [
-            "Test Case",
-            "Iter 1", "Iter 2", "Iter 3", "Iter 4", "Iter 5",
-            "Average", "Baseline", "Notes", # Test Case Notes
-            "Steps", "Priority", "Quip URL" # Hidden columns
-        ]
-        self.setHorizontalHeaderLabels(headers)
-
         # Configure table appearance
-        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents) # Test Case Name column
-        self.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeToContents) # Baseline column
-        self.horizontalHeader().setSectionResizeMode(8, QHeaderView.Stretch) # Notes column
-        for i in range(1, 6): # Iteration columns
-             self.horizontalHeader().setSectionResizeMode(i, QHeaderView.ResizeToContents)
+        self._set_column_resize_modes()
         self.verticalHeader().setVisible(False) # Hide row numbers
+        # Uniform, fixed row height: rows never need to be measured on insert/reset
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
 
         # Configure selection behavior
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.SingleSelection) # Only one row can be selected at a time
 
-        # Hide columns that will be displayed elsewhere
-        self.setColumnHidden(9, True)  # Steps
-        self.setColumnHidden(10, True) # Priority
-        self.setColumnHidden(11, True) # Quip URL
-
         # Enable editing for notes and baseline
         self.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked | QAbstractItemView.AnyKeyPressed)
 
+    def _set_column_resize_modes(self):
+        """(Re)applies the per-column resize modes."""
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.ResizeToContents) # Test Case Name column
+        header.setSectionResizeMode(COL_BASELINE, QHeaderView.ResizeToContents) # Baseline column
+        header.setSectionResizeMode(COL_NOTES, QHeaderView.Stretch) # Notes column
+        for i in range(COL_ITER1, COL_ITER5 + 1): # Iteration columns
+             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+
     def connect_signals(self):
-        # Connect selection change to emit custom signal
-        self.itemSelectionChanged.connect(self.handle_selection_change)
-        # Connect cell change for direct editing
-        self.cellChanged.connect(self.handle_cell_changed)
+        # Connect selection change to emit custom signal (deferred, see _sel_timer)
+        self.selectionModel().selectionChanged.connect(self._schedule_selection_change)
+        self._sel_timer.timeout.connect(self.handle_selection_change)
+        # Edits committed in the view (Notes, Baseline)
+        self._model.cell_edited.connect(self.handle_cell_changed)
 
     def load_session_data(self, session: Session):
         """Loads test cases from a session into the table."""
         self.session_data = session
+        self._rebuild_orig_index()
+        self.mark_dirty() # Always rebuild for a (re)loaded session
         # Apply the current filter after loading
         self.apply_priority_filter(self._current_filter)
-        print(f"Test table loaded data for session: Week={session.week}, TCs={len(session.test_cases)}")
+        log.debug("Test table loaded data for session: Week=%s, TCs=%d", session.week, len(session.test_cases))
 
+    def _rebuild_orig_index(self):
+        """Rebuilds the TestCase -> session index map, call after adding/removing test cases."""
+        test_cases = self.session_data.test_cases if self.session_data else ()
+        self._tc_to_orig_index = {id(tc): i for i, tc in enumerate(test_cases)}
+
+    def mark_dirty(self):
+        """Forces the next apply_priority_filter to rebuild, call when test cases are added/removed."""
+        self._last_filter_sig = (None, None, None)
+
+    @pyqtSlot(str)
     def apply_priority_filter(self, priority: str):
         """Filters the table rows based on the selected priority."""
         self._current_filter = priority
-        self.clearContents() # Clear existing rows
-        self.setRowCount(0)
+
+        sig = (priority, id(self.session_data), len(self.session_data.test_cases) if self.session_data else 0)
+        if sig == self._last_filter_sig:
+            return # Same filter over the same list, rows and selection are already right
+        self._last_filter_sig = sig
 
         if not self.session_data:
             self.filtered_test_cases = []
-            print("No session data to filter.")
+            self._model.set_test_cases(self.filtered_test_cases)
+            log.debug("No session data to filter.")
             return
 
         # Filter the list of test cases
@@ -97,128 +328,79 @@ class TestTableWidget(QTableWidget):
         else:
             self.filtered_test_cases = [tc for tc in self.session_data.test_cases if tc.priority == priority]
 
-        # Populate the table with filtered data
-        self.setRowCount(len(self.filtered_test_cases))
-        for row_index, tc in enumerate(self.filtered_test_cases):
-            self.insert_test_case_row(row_index, tc)
-
-        print(f"Applied filter: '{priority}'. Displaying {len(self.filtered_test_cases)} test cases.")
-
-        # Automatically select the first row if any exist
-        if self.rowCount() > 0:
-            self.selectRow(0)
-        else:
-            # If no rows, emit signal with None/invalid data to reset dependent widgets
-            self.current_test_case_changed.emit(-1, TestCase(name=""), 0)
-
-
-    def insert_test_case_row(self, row_index: int, tc: TestCase):
-        """Populates a single row in the table with TestCase data."""
-        # Temporarily block signals to prevent cellChanged from firing during population
-        self.blockSignals(True)
-
-        self.setItem(row_index, 0, QTableWidgetItem(tc.name)) # Test Case Name
-
-        # Iteration times and notes
-        for i in range(5):
-            iter_col = i + 1
-            iter_notes_col = 8 # Notes column is currently fixed at index 8
-            iter_data = tc.iterations[i] if i < len(tc.iterations) else Iteration()
-
-            # Iteration Time Cell
-            time_item = QTableWidgetItem(format_time(iter_data.time_ms))
-            time_item.setData(Qt.UserRole, iter_data.time_ms) # Store actual value
-            time_item.setFlags(time_item.flags() & ~Qt.ItemIsEditable) # Make time cells non-editable
-            if iter_data.skipped:
-                 time_item.setBackground(QColor(200, 200, 200)) # Grey out skipped
-            self.setItem(row_index, iter_col, time_item)
-
-        self.update_row_calculations(row_index) # Calculate and display average and spike
-
-        # Baseline
-        baseline_item = QTableWidgetItem(format_time(tc.baseline_ms))
-        baseline_item.setData(Qt.UserRole, tc.baseline_ms) # Store actual value
-        self.setItem(row_index, 7, baseline_item) # Baseline column
-
-        # Test Case Notes (make editable)
-        notes_item = QTableWidgetItem(tc.test_notes)
-        self.setItem(row_index, 8, notes_item) # Test Case Notes column
-
-        # Hidden columns (Steps, Priority, Quip) - store data here but keep hidden
-        self.setItem(row_index, 9, QTableWidgetItem("; ".join(tc.steps))) # Steps
-        self.setItem(row_index, 10, QTableWidgetItem(tc.priority))       # Priority
-        self.setItem(row_index, 11, QTableWidgetItem(tc.quip_url))       # Quip URL
-
-
-        self.blockSignals(False) # Re-enable signals
+        # No editor may open while the model resets and the first row is selected
+        old_triggers = self.editTriggers()
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        try:
+            # Hand the list to the model, the view pulls cell values on demand.
+            # ResizeToContents columns measure every row, so keep the header fixed and the
+            # view from painting while the model resets, then size the columns once.
+            self.setUpdatesEnabled(False)
+            self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self._populating = True
+            try:
+                self._model.set_test_cases(self.filtered_test_cases)
+            finally:
+                self._populating = False
+                self._set_column_resize_modes()
+                self.setUpdatesEnabled(True)
+            self._last_emitted_row = -2 # Rows now refer to different test cases
+
+            log.debug("Applied filter: '%s'. Displaying %d test cases.", priority, len(self.filtered_test_cases))
+
+            # Automatically select the first row if any exist. Selected directly on the
+            # selection model with the deferred handler muted, listeners get one emit below.
+            if self.filtered_test_cases:
+                self._populating = True
+                try:
+                    self.selectionModel().setCurrentIndex(self._model.index(0, COL_NAME),
+                                                          QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+                finally:
+                    self._populating = False
+                self._sel_timer.stop()
+                self._emit_current_row(0)
+            else:
+                # If no rows, emit signal with None/invalid data to reset dependent widgets
+                self._sel_timer.stop()
+                self._last_emitted_row = -1
+                self.current_test_case_changed.emit(-1, TestCase(name=""), 0)
+        finally:
+            self.setEditTriggers(old_triggers)
 
     def update_row_calculations(self, row_index: int):
-        """Calculates and updates the average and spike highlighting for a specific row."""
-        # Get the corresponding TestCase object from the filtered list
+        """Refreshes the average and spike highlighting for a specific row."""
         if row_index < 0 or row_index >= len(self.filtered_test_cases):
-            print(f"Error: update_row_calculations called with invalid row index {row_index}")
+            log.error("update_row_calculations called with invalid row index %d", row_index)
             return
+        # Average and the iteration backgrounds are recomputed by the model when the view repaints them
+        self._model.invalidate_row(row_index)
+        self._model.refresh_cells(row_index, COL_ITER1, COL_AVG, _TIME_ROLES)
 
-        tc = self.filtered_test_cases[row_index]
-
-        # Calculate Average
-        average_ms = calculate_average(tc.iterations)
-        avg_item = QTableWidgetItem(format_time(average_ms))
-        avg_item.setData(Qt.UserRole, average_ms) # Store actual value
-        avg_item.setFlags(avg_item.flags() & ~Qt.ItemIsEditable) # Make average cell non-editable
-        self.setItem(row_index, 6, avg_item) # Average column
-
-        # Update spike highlighting for iteration cells (Iter 1-5)
-        baseline_ms = tc.baseline_ms if tc.baseline_ms is not None else (average_ms if average_ms is not None else None) # Prefer baseline, then average
-        for i in range(5):
-            iter_col = i + 1
-            iter_item = self.item(row_index, iter_col)
-            if iter_item is None: continue # Should not happen if row was inserted correctly
-
-            iter_data = tc.iterations[i] if i < len(tc.iterations) else Iteration()
-            iter_ms = iter_data.time_ms
-
-            # Reset background first
-            iter_item.setBackground(self.palette().base().color()) # Default background
 
-            if iter_data.skipped:
-                 iter_item.setBackground(QColor(200, 200, 200)) # Grey out skipped
-                 continue # No spike calculation for skipped
-
-            spike_pct = calculate_spike(iter_ms, tc.baseline_ms, average_ms) # Use baseline first, then average
-            if spike_pct is not None and spike_pct > 0:
-                if spike_pct >= SPIKE_THRESHOLD_MAJOR:
-                    iter_item.setBackground(SPIKE_COLOR_MAJOR)
-                elif spike_pct >= SPIKE_THRESHOLD_MINOR:
-                    iter_item.setBackground(SPIKE_COLOR_MINOR)
-
-
-    @pyqtSlot(int, int, Iteration)
-    def update_iteration_data(self, row_index_in_filtered_list: int, iteration_index: int, iteration_data: Iteration):
-        """Slot to receive iteration data from stopwatch and update the table and data model."""
+    @pyqtSlot(int, int)
+    def update_iteration_data(self, row_index_in_filtered_list: int, iteration_index: int):
+        """Slot called when the stopwatch saved an iteration, updates the table and data model."""
         # row_index_in_filtered_list is the visual row index in the table
         # We need to find the corresponding TestCase in the main self.session_data.test_cases list
         # This is crucial because the filtered list changes, but the underlying data model is constant.
 
         if self.session_data is None or row_index_in_filtered_list < 0 or row_index_in_filtered_list >= len(self.filtered_test_cases):
-             print(f"Error: Cannot update iteration data. Invalid row index or no session loaded. Row: {row_index_in_filtered_list}, Iter: {iteration_index}")
+             log.error("Cannot update iteration data. Invalid row index or no session loaded. Row: %d, Iter: %d",
+                       row_index_in_filtered_list, iteration_index)
              return
 
         # Get the TestCase from the *filtered* list using the row index
         tc_in_filtered_list = self.filtered_test_cases[row_index_in_filtered_list]
 
-        # Find the *original* index of this TestCase in the full session data list
-        original_row_index = -1
-        if self.session_data: # Should not be None based on checks above
-             try:
-                # Find the index of the object reference itself
-                original_row_index = self.session_data.test_cases.index(tc_in_filtered_list)
-             except ValueError:
-                print(f"Error: Could not find test case '{tc_in_filtered_list.name}' in original session data list.")
-                return # Cannot update data model if TC not found
+        # Find the *original* index of this TestCase (by object identity) in the full session data list
+        original_row_index = self._tc_to_orig_index.get(id(tc_in_filtered_list), -1)
+        if original_row_index == -1:
+            log.error("Could not find test case '%s' in original session data list.", tc_in_filtered_list.name)
+            return # Cannot update data model if TC not found
 
-        if original_row_index == -1 or iteration_index < 0 or iteration_index >= 5:
-             print(f"Error: Invalid iteration index or original row index found. Orig Index: {original_row_index}, Iter: {iteration_index}")
+        if iteration_index < 0 or iteration_index >= 5:
+             log.error("Invalid iteration index found. Orig Index: %d, Iter: %d",
+                       original_row_index, iteration_index)
              return
 
         # Update the data in the actual Session object
@@ -226,108 +408,90 @@ class TestTableWidget(QTableWidget):
         while len(self.session_data.test_cases[original_row_index].iterations) <= iteration_index:
             self.session_data.test_cases[original_row_index].iterations.append(Iteration())
 
-        # Update the specific iteration object
-        self.session_data.test_cases[original_row_index].iterations[iteration_index] = iteration_data
-        print(f"Data model updated for TC: '{tc_in_filtered_list.name}', Iteration: {iteration_index + 1}")
-
-
-        # Now update the table cell visually (in the filtered view)
-        # Temporarily block signals to prevent handle_cell_changed from firing
-        self.blockSignals(True)
+        # The stopwatch updated the Iteration in place on the shared TestCase,
+        # only its cached first empty iteration needs to follow
+        self.session_data.test_cases[original_row_index].iteration_changed(iteration_index)
+        log.debug("Data model updated for TC: '%s', Iteration: %d", tc_in_filtered_list.name, iteration_index + 1)
 
-        iter_col = iteration_index + 1
-        time_item = self.item(row_index_in_filtered_list, iter_col)
-        if time_item:
-            time_item.setText(format_time(iteration_data.time_ms))
-            time_item.setData(Qt.UserRole, iteration_data.time_ms)
-            if iteration_data.skipped:
-                 time_item.setBackground(QColor(200, 200, 200)) # Grey out skipped
-            else:
-                 time_item.setBackground(self.palette().base().color()) # Reset background if not skipped
-        else:
-            # This should not happen if the row exists, but as a fallback
-            print(f"Warning: Could not find item at row {row_index_in_filtered_list}, col {iter_col} to update visually.")
-
-
-        # Recalculate and update average and spike highlighting for this row
+        # One repaint for the new time plus the row's average and spike highlighting
         self.update_row_calculations(row_index_in_filtered_list)
 
-        self.blockSignals(False) # Re-enable signals
 
+    @pyqtSlot()
+    def _schedule_selection_change(self):
+        if not self._populating:
+            self._sel_timer.start()
 
+    @pyqtSlot()
     def handle_selection_change(self):
         """Handles selection change and emits signal with current test case data."""
-        selected_rows = self.selectedIndexes()
-        if not selected_rows:
+        row_index = self._selected_row()
+        if row_index < 0:
+            if self._last_emitted_row == -1:
+                return # Listeners were already reset
             # No row selected, emit signal with invalid data
-            print("Table selection cleared.")
+            log.debug("Table selection cleared.")
+            self._last_emitted_row = -1
             self.current_test_case_changed.emit(-1, TestCase(name=""), 0)
             return
 
-        # Get the row index of the first selected item (since SingleSelection mode)
-        row_index = selected_rows[0].row()
+        if row_index == self._last_emitted_row:
+            return # Same row re-selected, listeners already have it
 
-        if row_index < 0 or row_index >= len(self.filtered_test_cases):
-            print(f"Error: Invalid row index selected: {row_index}")
+        if row_index >= len(self.filtered_test_cases):
+            log.error("Invalid row index selected: %d", row_index)
             # Emit signal with invalid data if something goes wrong
+            self._last_emitted_row = -1
             self.current_test_case_changed.emit(-1, TestCase(name=""), 0)
             return
 
+        self._emit_current_row(row_index)
+
+    def _emit_current_row(self, row_index: int):
+        """Emits current_test_case_changed for a valid row of the filtered list."""
         # Get the corresponding TestCase object from the filtered list
         selected_tc = self.filtered_test_cases[row_index]
 
-        # Find the first empty iteration index for this test case
-        first_empty_iter = next((i for i, iter in enumerate(selected_tc.iterations) if iter.time_ms is None), len(selected_tc.iterations))
+        # First empty iteration index for this test case (cached on the TestCase)
+        first_empty_iter = selected_tc.first_empty_iter
 
-        print(f"Table selection changed to row {row_index}: '{selected_tc.name}', first empty iter: {first_empty_iter + 1}")
+        log.debug("Table selection changed to row %d: '%s', first empty iter: %d", row_index, selected_tc.name, first_empty_iter + 1)
 
         # Emit signal with row index (in the filtered view), TestCase object, and first empty iteration index
+        self._last_emitted_row = row_index
         self.current_test_case_changed.emit(row_index, selected_tc, first_empty_iter)
 
-    def handle_cell_changed(self, row: int, column: int):
+    @pyqtSlot(int, int, str)
+    def handle_cell_changed(self, row: int, column: int, entered_text: str):
          """Handles manual editing of cells (Notes, Baseline)."""
-         # Temporarily block signals to prevent recursive calls if setText/setData is used below
-         self.blockSignals(True)
-
-         # Get the item that was changed
-         item = self.item(row, column)
-         if item is None:
-             self.blockSignals(False)
-             return
-
-         new_value = item.text().strip()
+         new_value = entered_text.strip()
 
          # Find the original test case object in the session data
          if self.session_data is None or row < 0 or row >= len(self.filtered_test_cases):
-             print(f"Error handling cell change: Invalid row index or no session data. Row: {row}, Col: {column}")
-             self.blockSignals(False)
+             log.error("Error handling cell change: Invalid row index or no session data. Row: %d, Col: %d", row, column)
              return
 
          tc_in_filtered_list = self.filtered_test_cases[row]
-         original_row_index = -1
-         try:
-             original_row_index = self.session_data.test_cases.index(tc_in_filtered_list)
-         except ValueError:
-             print(f"Error handling cell change: Could not find test case '{tc_in_filtered_list.name}' in original session data.")
-             self.blockSignals(False)
+         original_row_index = self._tc_to_orig_index.get(id(tc_in_filtered_list), -1)
+         if original_row_index == -1:
+             log.error("Error handling cell change: Could not find test case '%s' in original session data.", tc_in_filtered_list.name)
              return
 
          tc = self.session_data.test_cases[original_row_index]
 
          # Update the data model based on the column
-         col_name = self.horizontalHeaderItem(column).text()
-
-         if col_name == "Notes": # Test Case Notes
+         if column == COL_NOTES: # Test Case Notes
              tc.test_notes = new_value
-             print(f"Updated Notes for '{tc.name}' to: {new_value}")
+             self._model.refresh_cells(row, column, column)
+             log.debug("Updated Notes for '%s' to: %s", tc.name, new_value)
              # Emit signal that data changed, potentially needed by Notes/Search tab
              self.cell_data_changed.emit(original_row_index, column, new_value)
 
-         elif col_name == "Baseline":
+         elif column == COL_BASELINE:
              try:
                  # Attempt to parse the new value as milliseconds (float)
                  # Handle potential 's' suffix or just raw number
-                 if new_value.lower().endswith('s'):
+                 if new_value and new_value[-1] in ('s', 'S'): # No lowercased copy just to test one char
                      ms_value = float(new_value[:-1]) * 1000
                  elif new_value: # Not empty
                      ms_value = float(new_value)
@@ -335,20 +499,19 @@ class TestTableWidget(QTableWidget):
                      ms_value = None
 
                  tc.baseline_ms = ms_value
-                 print(f"Updated Baseline for '{tc.name}' to: {ms_value} ms")
+                 log.debug("Updated Baseline for '%s' to: %s ms", tc.name, ms_value)
 
-                 # Reformat the cell text to ensure consistency (e.g., 1234.56ms becomes 1.235s)
-                 item.setText(format_time(ms_value))
-                 item.setData(Qt.UserRole, ms_value) # Store numeric value
-                 self.update_row_calculations(row) # Recalculate spike highlighting based on new baseline
+                 # The cell shows the reformatted value (e.g., 1234.56 becomes 1.235s) and the
+                 # spike highlighting follows the new baseline, one dataChanged for iterations..baseline
+                 self._model.invalidate_row(row)
+                 self._model.refresh_cells(row, COL_ITER1, COL_BASELINE, _TIME_ROLES)
 
                  # Emit signal that data changed
                  self.cell_data_changed.emit(original_row_index, column, ms_value)
 
              except ValueError:
-                 print(f"Invalid Baseline value entered: {new_value}. Must be a number.")
-                 # Revert the cell text to the previous valid value or empty
-                 # item.setText(format_time(tc.baseline_ms)) # Revert visually
+                 log.warning("Invalid Baseline value entered: %s. Must be a number.", new_value)
+                 # The cell keeps showing the previous valid value
                  # Don't emit signal if value is invalid
 
 
@@ -361,15 +524,15 @@ class TestTableWidget(QTableWidget):
                   # Emit signal? Maybe only if Notes/Search tab needs it live
 
 
-         self.blockSignals(False) # Re-enable signals
-
-
     # Method to get the currently selected test case object
+    def _selected_row(self) -> int:
+        """Row of the selection (SingleSelection + SelectRows: the current row), -1 if nothing is selected."""
+        selection_model = self.selectionModel()
+        # The current index stays put when the selection is cleared, so check that too
+        return selection_model.currentIndex().row() if selection_model.hasSelection() else -1
+
     def get_current_test_case(self) -> Optional[TestCase]:
-        selected_rows = self.selectedIndexes()
-        if not selected_rows:
-            return None
-        row_index = selected_rows[0].row()
+        row_index = self._selected_row()
         if row_index < 0 or row_index >= len(self.filtered_test_cases):
             return None
         return self.filtered_test_cases[row_index]
@@ -392,6 +555,8 @@ class TestTableWidget(QTableWidget):
     #      if self.session_data is None: return
     #      new_tc = TestCase(name="New Test Case", priority=self._current_filter)
     #      self.session_data.test_cases.append(new_tc)
+    #      self._tc_to_orig_index[id(new_tc)] = len(self.session_data.test_cases) - 1
+    #      self.mark_dirty()
     #      # Reapply filter to show the new TC if it matches the current filter
     #      self.apply_priority_filter(self._current_filter)
     #      # Select the new row? Need to find its index after filtering/sorting
@@ -410,12 +575,14 @@ class TestTableWidget(QTableWidget):
     #     # Remove from the original session data list
     #     try:
     #         self.session_data.test_cases.remove(tc_to_remove)
+    #         self._rebuild_orig_index() # Indices after the removed TC shifted
+    #         self.mark_dirty()
     #         print(f"Removed test case '{tc_to_remove.name}' from session data.")
     #         # Remove from the table view
-    #         self.removeRow(row_index_in_filtered_list)
+    #         self.apply_priority_filter(self._current_filter)
     #         # Re-select the row that was next, or clear selection
-    #         if self.rowCount() > 0:
-    #              next_row_index = min(row_index_in_filtered_list, self.rowCount() - 1)
+    #         if self.filtered_test_cases:
+    #              next_row_index = min(row_index_in_filtered_list, len(self.filtered_test_cases) - 1)
     #              self.selectRow(next_row_index)
     #         else:
     #              self.clearSelection()
@@ -488,9 +655,10 @@ if __name__ == '__main__':
 
             if tc1_filtered_index != -1:
                  print(f"\nSimulating stopwatch updating TC1 ('App Launch', filtered row {tc1_filtered_index})...")
-                 new_iter_data = Iteration(time_ms=990.0, notes="Another run")
-                 # The stopwatch emits the row index *in its view*, which corresponds to the index in the filtered list
-                 self.test_table.update_iteration_data(tc1_filtered_index, 2, new_iter_data) # Update 3rd iteration (index 2)
+                 # The stopwatch updates the shared TestCase in place, then emits the row index *in its view*,
+                 # which corresponds to the index in the filtered list
+                 self.test_table.filtered_test_cases[tc1_filtered_index].iterations[2] = Iteration(time_ms=990.0, notes="Another run")
+                 self.test_table.update_iteration_data(tc1_filtered_index, 2) # Update 3rd iteration (index 2)
 
             # Simulate changing the filter
             print("\nSimulating changing filter to P1...")
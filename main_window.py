@@ -1,9 +1,15 @@
 # main_window.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
 from PyQt5.QtWidgets import (QMainWindow, QToolBar, QTabWidget, QVBoxLayout,
-                             QWidget, QApplication, QAction, QStatusBar,
-                             QMessageBox, QFileDialog, QLabel)
+                             QWidget, QAction, QStatusBar,
+                             QMessageBox, QFileDialog, QLabel, QShortcut)
 from PyQt5.QtGui import QIcon, QKeySequence
-from PyQt5.QtCore import Qt, pyqtSlot, QTimer
+from PyQt5.QtCore import (Qt, pyqtSignal, pyqtSlot, QObject,
+                          QRunnable, QThreadPool, QSignalBlocker)
 from typing import Optional
 
 # Local imports
@@ -13,13 +19,55 @@ from .widgets.test_steps_viewer import TestStepsViewerWidget
 from .widgets.history_view import HistoryViewWidget
 from .widgets.notes_search import NotesSearchWidget
 from .widgets.project_popup import ProjectPopup
-from .utils.data_model import Session, TestCase
-from .utils.file_manager import save_session, load_session, load_test_case_template, export_session_to_csv # Import export
+from .utils.data_model import Session, TestCase, PRIORITY_LEVELS, PRIORITY_CHOICES_SET
+from .utils.file_manager import (save_session_data, load_session, load_test_case_template,
+                                 export_session_to_csv, safe_filename_part) # Import export
 from .utils.timer_utils import format_time # Useful for status bar
 
+log = logging.getLogger(__name__)
+
+
+class _WorkerSignals(QObject):
+    """Signals for background file tasks (QRunnable itself can't emit signals)."""
+    finished = pyqtSignal(str) # filepath
+    failed = pyqtSignal(str) # error message
+
+
+class _FileTaskRunnable(QRunnable):
+    """Writes a session snapshot to a file on a QThreadPool thread (task is save_session_data or export_session_to_csv)."""
+    def __init__(self, task, snapshot, filepath: str):
+        super().__init__()
+        self.task = task
+        self.snapshot = snapshot # Session.to_dict() for saves, a Session copy for exports
+        self.filepath = filepath
+        self.signals = _WorkerSignals() # Created on the GUI thread, so emits are queued back to it
+
+    def run(self):
+        try:
+            self.task(self.snapshot, self.filepath)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.filepath)
+
 
 class MainWindow(QMainWindow):
     """Main window of the KindlePerfMate application."""
+
+    # Signal emitted when a background CSV export has been written
+    # Emits: filepath (str)
+    export_completed = pyqtSignal(str)
+
+    # (theme name, fallback path) -> QIcon, shared by all instances so the theme/disk lookups happen once
+    _ICON_CACHE = {}
+
+    @classmethod
+    def _icon(cls, theme_name: str, fallback_path: str) -> QIcon:
+        icon = cls._ICON_CACHE.get((theme_name, fallback_path))
+        if icon is None:
+            icon = cls._ICON_CACHE[theme_name, fallback_path] = QIcon.fromTheme(theme_name, QIcon(fallback_path))
+        return icon
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("KindlePerfMate")
@@ -27,20 +75,28 @@ class MainWindow(QMainWindow):
 
         self.current_session: Optional[Session] = None
         self._current_session_filepath: Optional[str] = None
+        self._current_session_basename: Optional[str] = None # File name part of the path above, for display
+        self._last_session_info: Optional[tuple] = None # What the session info label currently shows
         self._unsaved_changes = False # Flag to track changes
+        self._project_popup: Optional[ProjectPopup] = None # Created on first new_project
+        self._file_dialog: Optional[QFileDialog] = None # Created on first save/load/export prompt
+        self._save_task: Optional[_FileTaskRunnable] = None # Running session save, if any
+        # Saves get their own pool, so waiting for one never waits on a running export too
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        self._export_task: Optional[_FileTaskRunnable] = None # Running CSV export, if any
 
         self.setup_ui()
         self.create_toolbar()
         self.connect_signals()
         self.setup_status_bar()
 
-        # Set up event filter to capture global key presses (like spacebar)
-        QApplication.instance().installEventFilter(self)
-
-        self.check_unsaved_timer = QTimer(self)
-        self.check_unsaved_timer.setInterval(5000) # Check every 5 seconds
-        self.check_unsaved_timer.timeout.connect(self._check_for_unsaved_changes)
-        self.check_unsaved_timer.start()
+        # Spacebar toggles the stopwatch while its tab is shown. A shortcut on the stopwatch page
+        # is only live while the page is visible, and text fields still get their spaces typed.
+        self.spacebar_shortcut = QShortcut(QKeySequence(Qt.Key_Space), self.stopwatch_widget)
+        self.spacebar_shortcut.setContext(Qt.WindowShortcut) # Also with focus on the tab bar/toolbar
+        self.spacebar_shortcut.setAutoRepeat(False) # Holding the key must not toggle on and off
+        self.spacebar_shortcut.activated.connect(self.stopwatch_widget.handle_spacebar_press)
 
         self.new_project() # Start with a new project on launch
 
@@ -53,61 +109,83 @@ class MainWindow(QMainWindow):
         self.stopwatch_widget = StopwatchWidget()
         self.test_table_widget = TestTableWidget()
         self.test_steps_viewer_widget = TestStepsViewerWidget()
-        self.history_view_widget = HistoryViewWidget()
+        self.history_view_widget: Optional[HistoryViewWidget] = None # Scans the sessions directory, built on first visit
         self.notes_search_widget = NotesSearchWidget()
 
         # Add widgets as tabs
         self.tab_widget.addTab(self.stopwatch_widget, "Stopwatch")
         self.tab_widget.addTab(self.test_table_widget, "Test Data")
         self.tab_widget.addTab(self.test_steps_viewer_widget, "Test Steps")
-        self.tab_widget.addTab(self.history_view_widget, "History")
+        self._history_tab_index = self.tab_widget.addTab(QWidget(), "History") # Placeholder
         self.tab_widget.addTab(self.notes_search_widget, "Notes & Search")
 
+        # Tabs whose widget is only created when the tab is first shown: index -> factory
+        self._tab_factories = {self._history_tab_index: self._create_history_view}
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+
+    @pyqtSlot(int)
+    def _on_tab_changed(self, index: int):
+        """Swaps a placeholder tab for its real widget the first time it's shown."""
+        factory = self._tab_factories.pop(index, None)
+        if factory is None:
+            return
+        widget = factory()
+        placeholder = self.tab_widget.widget(index)
+        with QSignalBlocker(self.tab_widget): # Don't re-enter while the tab is swapped
+            title = self.tab_widget.tabText(index)
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, widget, title)
+            self.tab_widget.setCurrentIndex(index)
+        placeholder.deleteLater()
+
+    def _create_history_view(self) -> HistoryViewWidget:
+        self.history_view_widget = HistoryViewWidget()
+        # Connect History view requests to Main Window load method
+        self.history_view_widget.load_session_requested.connect(self.load_session)
+        return self.history_view_widget
+
     def create_toolbar(self):
         """Creates and populates the application toolbar."""
         toolbar = self.addToolBar("Main Toolbar")
 
-        # Icons (Using built-in icons or placeholder text)
-        # You should replace these with actual .png icons from assets/icons
-        new_icon = QIcon.fromTheme("document-new", QIcon("assets/icons/new.png")) # Placeholder
-        save_icon = QIcon.fromTheme("document-save", QIcon("assets/icons/save.png"))
-        load_icon = QIcon.fromTheme("document-open", QIcon("assets/icons/load.png"))
-        export_icon = QIcon.fromTheme("document-export", QIcon("assets/icons/export.png"))
-        timer_icon = QIcon.fromTheme("chronometer", QIcon("assets/icons/timer.png")) # Adjust theme icon if needed
-
-        # Actions
-        new_action = QAction(new_icon, "&New Project", self)
-        new_action.setStatusTip("Create a new performance testing session")
-        new_action.triggered.connect(self.new_project)
-        toolbar.addAction(new_action)
-
-        save_action = QAction(save_icon, "&Save Session", self)
-        save_action.setStatusTip("Save the current performance session")
-        save_action.setShortcut(QKeySequence.Save)
-        save_action.triggered.connect(self.save_session)
-        toolbar.addAction(save_action)
-
-        load_action = QAction(load_icon, "&Load History", self)
-        load_action.setStatusTip("View and load past performance sessions")
-        load_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.history_view_widget)) # Switch to history tab
-        toolbar.addAction(load_action)
-
-        toolbar.addSeparator()
-
-        export_action = QAction(export_icon, "&Export Data", self)
-        export_action.setStatusTip("Export current session data to CSV")
-        export_action.triggered.connect(self.export_session)
-        toolbar.addAction(export_action)
-
-        toolbar.addSeparator()
-
-        # Toggle Stopwatch/Timer Action (could potentially switch tabs or control the widget)
-        # Let's make this action switch to the stopwatch tab for now.
-        toggle_stopwatch_action = QAction(timer_icon, "&Stopwatch", self)
-        toggle_stopwatch_action.setStatusTip("Switch to the Stopwatch tab")
-        # toggle_stopwatch_action.setShortcut(Qt.Key_Space) # Handled by event filter
-        toggle_stopwatch_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.stopwatch_widget))
-        toolbar.addAction(toggle_stopwatch_action)
+        # (theme icon, fallback icon, text, status tip, shortcut, slot, attribute to keep it in), None = separator.
+        # Icons: built-in theme icons, you should replace the fallbacks with actual .png icons from assets/icons
+        # Toggle Stopwatch/Timer action switches to the stopwatch tab for now (Space toggles it via spacebar_shortcut)
+        actions = (
+            ("document-new", "assets/icons/new.png", "&New Project",
+             "Create a new performance testing session", None, self.new_project, None),
+            ("document-save", "assets/icons/save.png", "&Save Session",
+             "Save the current performance session", QKeySequence.Save, self.save_session, "save_action"),
+            ("document-open", "assets/icons/load.png", "&Load History",
+             "View and load past performance sessions", None, self._show_history_tab, None),
+            None,
+            ("document-export", "assets/icons/export.png", "&Export Data",
+             "Export current session data to CSV", None, self.export_session, "export_action"),
+            None,
+            ("chronometer", "assets/icons/timer.png", "&Stopwatch", # Adjust theme icon if needed
+             "Switch to the Stopwatch tab", None, self._show_stopwatch_tab, None),
+        )
+        for spec in actions:
+            if spec is None:
+                toolbar.addSeparator()
+                continue
+            theme_name, fallback_path, text, tip, shortcut, slot, attr = spec
+            action = QAction(self._icon(theme_name, fallback_path), text, self)
+            action.setStatusTip(tip)
+            if shortcut is not None:
+                action.setShortcut(shortcut)
+            action.triggered.connect(slot)
+            toolbar.addAction(action)
+            if attr:
+                setattr(self, attr, action)
+
+    @pyqtSlot()
+    def _show_history_tab(self):
+        self.tab_widget.setCurrentIndex(self._history_tab_index) # Creates the history view on first use
+
+    @pyqtSlot()
+    def _show_stopwatch_tab(self):
+        self.tab_widget.setCurrentWidget(self.stopwatch_widget)
 
     def connect_signals(self):
         """Connects signals between widgets and Main Window methods."""
@@ -115,21 +193,21 @@ class MainWindow(QMainWindow):
         self.stopwatch_widget.iteration_saved.connect(self.test_table_widget.update_iteration_data)
         # Connect Table to Stopwatch and Steps Viewer
         self.test_table_widget.current_test_case_changed.connect(self.stopwatch_widget.update_current_test_case_info)
-        self.test_table_widget.current_test_case_changed.connect(self.test_steps_viewer_widget.update_test_case_info)
+        # The steps viewer is display-only, let it refresh from the event loop instead of inside the emit
+        self.test_table_widget.current_test_case_changed.connect(self.test_steps_viewer_widget.update_test_case_info,
+                                                                 Qt.QueuedConnection)
         # Connect Stopwatch filter to Table filter
         self.stopwatch_widget.priority_filter_changed.connect(self.test_table_widget.apply_priority_filter)
-        # Connect Table cell changes to update global notes (if TC notes changed) or set unsaved flag
-        self.test_table_widget.cell_data_changed.connect(self._handle_data_changed)
+        # Table cell edits already update the session data in place, they only need to set
+        # the unsaved flag (below)
 
         # Connect Notes widget changes to update session data and set unsaved flag
         self.notes_search_widget.global_notes_changed.connect(self._handle_global_notes_changed)
 
-        # Connect History view requests to Main Window load method
-        self.history_view_widget.load_session_requested.connect(self.load_session)
-
-        # Connect signals that indicate changes requiring save
+        # Connect signals that indicate changes requiring save. Direct: a queued call could land
+        # after a save in the same tick and flag the already written edit as unsaved again
         self.test_table_widget.cell_data_changed.connect(self._set_unsaved_changes)
-        self.notes_search_widget.global_notes_changed.connect(self._set_unsaved_changes)
+        self.notes_search_widget.global_notes_changed.connect(self._set_unsaved_changes) # Already debounced
         # Iteration saves also mean changes
         self.stopwatch_widget.iteration_saved.connect(self._set_unsaved_changes)
         # Add/Remove TC context menu actions (if implemented) should also call _set_unsaved_changes
@@ -149,41 +227,70 @@ class MainWindow(QMainWindow):
 
     def update_session_info_display(self):
          """Updates the status bar with current session details."""
-         if self.current_session:
-              info = f"Session: {self.current_session.week} | {self.current_session.device} | {self.current_session.build}"
+         session = self.current_session
+         key = (session.week, session.device, session.build, self._current_session_basename) if session else ()
+         if key == self._last_session_info:
+              return # Label already shows this, skip the relayout
+         self._last_session_info = key
+
+         if session:
+              info = f"Session: {session.week} | {session.device} | {session.build}"
               if self._current_session_filepath:
-                   info += f" | Saved to: {os.path.basename(self._current_session_filepath)}"
+                   info += f" | Saved to: {self._current_session_basename}"
               self.session_info_label.setText(info)
          else:
               self.session_info_label.setText("No active session")
 
+    def _set_session_filepath(self, filepath: Optional[str]):
+         """Sets the current session file path and caches its file name for display."""
+         self._current_session_filepath = filepath
+         self._current_session_basename = os.path.basename(filepath) if filepath else None
+
+    @pyqtSlot()
     def _set_unsaved_changes(self):
         """Sets the internal flag indicating unsaved changes."""
         if not self._unsaved_changes:
             self._unsaved_changes = True
-            print("Unsaved changes detected.")
             self.setWindowTitle("KindlePerfMate *") # Indicate unsaved changes
 
+    @pyqtSlot()
     def _clear_unsaved_changes(self):
         """Clears the internal flag indicating unsaved changes."""
         if self._unsaved_changes:
             self._unsaved_changes = False
-            print("Unsaved changes cleared.")
+            log.debug("Unsaved changes cleared.")
             self.setWindowTitle("KindlePerfMate")
 
-    def _check_for_unsaved_changes(self):
-        """Periodically checks if the session data has been modified and updates the flag."""
-        # This requires comparing the current state to a saved state or deep copy.
-        # A simpler approach for now: The signals themselves set the flag.
-        # This timer is useful for prompting before closing, not detecting *all* changes.
-        # For now, we just print a message if the flag is set.
-        if self._unsaved_changes:
-            # print("Periodic check: Unsaved changes exist.")
-            pass # The signal connections are responsible for setting _unsaved_changes
 
+    def _prompt_filepath(self, accept_mode, caption: str, initial: str, name_filter: str) -> str:
+        """Asks for a file to save to (QFileDialog.AcceptSave) or open (AcceptOpen), "" if cancelled.
+
+        One dialog is reused for the window's lifetime instead of building one per prompt.
+        """
+        if self._file_dialog is None:
+            self._file_dialog = QFileDialog(self)
+        dialog = self._file_dialog
+        dialog.setAcceptMode(accept_mode)
+        dialog.setFileMode(QFileDialog.AnyFile if accept_mode == QFileDialog.AcceptSave else QFileDialog.ExistingFile)
+        dialog.setWindowTitle(caption)
+        dialog.setNameFilter(name_filter)
+        dialog.selectFile(initial)
+        if dialog.exec_() != QFileDialog.Accepted:
+            return ""
+        selected = dialog.selectedFiles()
+        return selected[0] if selected else ""
+
+    def _flush_pending_notes(self):
+        """Applies global notes still inside the notes widget's debounce, so they aren't lost
+        when the session is saved, exported or replaced right after typing."""
+        notes = self.notes_search_widget.take_pending_notes()
+        if notes is not None and self.current_session:
+            self._handle_global_notes_changed(notes)
+            self._set_unsaved_changes() # Directly, a queued call could land after the save clears the flag
 
     def closeEvent(self, event):
         """Handles the window closing event, checks for unsaved changes."""
+        self._flush_pending_notes()
         if self._unsaved_changes:
             reply = QMessageBox.question(self, 'Save Changes',
                                          "You have unsaved changes. Do you want to save before quitting?",
@@ -191,7 +298,7 @@ class MainWindow(QMainWindow):
                                          QMessageBox.Save) # Default button
 
             if reply == QMessageBox.Save:
-                if self.save_session(): # Try to save
+                if self.save_session(wait=True): # Try to save, before the window goes away
                     event.accept() # Close if save was successful
                 else:
                     event.ignore() # Don't close if save failed (e.g., user cancelled save dialog)
@@ -206,6 +313,7 @@ class MainWindow(QMainWindow):
     @pyqtSlot()
     def new_project(self):
         """Opens a popup for new project details and initializes a new session."""
+        self._flush_pending_notes()
         if self._unsaved_changes:
              reply = QMessageBox.question(self, 'Unsaved Changes',
                                           "Creating a new project will discard unsaved changes in the current session. Continue?",
@@ -213,10 +321,14 @@ class MainWindow(QMainWindow):
              if reply == QMessageBox.Cancel:
                   return # User cancelled
 
-        popup = ProjectPopup(self)
+        # One dialog for the window's lifetime, emptied before each use
+        if self._project_popup is None:
+            self._project_popup = ProjectPopup(self)
+        popup = self._project_popup
+        popup.reset_fields()
         if popup.exec_() == ProjectPopup.Accepted:
             project_data = popup.get_data()
-            print("New Project Data:", project_data)
+            log.debug("New Project Data: %s", project_data)
 
             # Create a new session object
             new_session = Session(
@@ -230,21 +342,19 @@ class MainWindow(QMainWindow):
             if new_session.priority_filter != "All":
                  # Load template only for the selected filter if not "All"
                  new_session.test_cases = load_test_case_template(new_session.priority_filter)
-                 print(f"Loaded {len(new_session.test_cases)} test cases for priority filter '{new_session.priority_filter}'.")
+                 log.debug("Loaded %d test cases for priority filter '%s'.", len(new_session.test_cases), new_session.priority_filter)
             else:
                  # If "All", load templates for all known priorities (P0, P1, P2, P3, 750)
-                 # This assumes you have template files for these. Adjust list as needed.
-                 all_priorities = ["P0", "P1", "P2", "P3", "750"]
-                 all_test_cases = []
-                 for p in all_priorities:
-                      all_test_cases.extend(load_test_case_template(p))
-                 new_session.test_cases = all_test_cases
-                 print(f"Loaded {len(new_session.test_cases)} test cases from all priorities for filter 'All'.")
+                 # This assumes you have template files for these. Adjust PRIORITY_LEVELS as needed.
+                 # The files are independent, read them concurrently (file I/O releases the GIL)
+                 with ThreadPoolExecutor(max_workers=len(PRIORITY_LEVELS)) as ex:
+                      new_session.test_cases = list(chain.from_iterable(ex.map(load_test_case_template, PRIORITY_LEVELS)))
+                 log.debug("Loaded %d test cases from all priorities for filter 'All'.", len(new_session.test_cases))
 
 
             # Set the new session as the current one
             self.current_session = new_session
-            self._current_session_filepath = None # New session is unsaved
+            self._set_session_filepath(None) # New session is unsaved
             self._clear_unsaved_changes() # It's brand new, no changes yet
 
             # Update all widgets with the new session data
@@ -256,8 +366,13 @@ class MainWindow(QMainWindow):
             self.statusBar.showMessage("New session cancelled.", 2000)
 
     @pyqtSlot()
-    def save_session(self) -> bool:
-        """Saves the current session to a JSON file."""
+    def save_session(self, wait: bool = False) -> bool:
+        """Saves the current session to a JSON file.
+
+        The file is written on a worker thread and True means the save was started.
+        With wait=True it's written before returning and the result is the outcome.
+        """
+        self._flush_pending_notes()
         if self.current_session is None:
             QMessageBox.warning(self, "No Session", "No active session to save.")
             return False
@@ -265,34 +380,77 @@ class MainWindow(QMainWindow):
         # If session hasn't been saved before, prompt for filename
         if self._current_session_filepath is None:
             # Suggest a default filename based on session details
-            week = self.current_session.week.replace(" ", "_").replace("/", "-")
-            device = self.current_session.device.replace(" ", "_").replace("/", "-")
+            week = safe_filename_part(self.current_session.week)
+            device = safe_filename_part(self.current_session.device)
             initial_filename = f"session_{week}_{device}.json"
-            filepath, _ = QFileDialog.getSaveFileName(self, "Save Session",
-                                                      initial_filename,
-                                                      "Kindle PerfMate Sessions (*.json);;All Files (*)")
+            filepath = self._prompt_filepath(QFileDialog.AcceptSave, "Save Session", initial_filename,
+                                             "Kindle PerfMate Sessions (*.json);;All Files (*)")
             if not filepath:
                 self.statusBar.showMessage("Save cancelled.", 2000)
                 return False # User cancelled save dialog
 
-            self._current_session_filepath = filepath
-
-        # Save the session data
-        try:
-            save_session(self.current_session, self._current_session_filepath)
-            self._clear_unsaved_changes() # Mark as saved
-            self.update_session_info_display()
-            self.statusBar.showMessage(f"Session saved to {os.path.basename(self._current_session_filepath)}", 3000)
+            self._set_session_filepath(filepath)
+
+        if self._save_task is not None:
+            if not wait:
+                self.statusBar.showMessage("A save is already in progress.", 2000)
+                return False
+            self._save_pool.waitForDone() # Let it finish, this save then overwrites it
+            # Its finished/failed are already queued and would land after the write below,
+            # forgetting the task makes _on_save_task_done ignore them
+            self._save_task = None
+
+        # Save a plain-dict copy, the user may keep editing the live session meanwhile. Only the
+        # JSON encoding and the write happen off the GUI thread. The copy is what ends up on disk,
+        # so it's clean from here; edits made during the write mark it dirty again.
+        snapshot = self.current_session.to_dict()
+        filepath = self._current_session_filepath
+        self._clear_unsaved_changes()
+
+        if wait:
+            try:
+                save_session_data(snapshot, filepath)
+            except Exception as e:
+                self._on_save_failed(str(e))
+                return False # Save failed
+            self._on_save_finished(filepath)
             return True # Save successful
-        except Exception as e:
-            QMessageBox.critical(self, "Save Error", f"Error saving session:\n{e}")
-            self.statusBar.showMessage("Error saving session.", 3000)
-            return False # Save failed
+
+        task = self._save_task = _FileTaskRunnable(save_session_data, snapshot, filepath)
+        task.signals.finished.connect(partial(self._on_save_task_done, task, self._on_save_finished))
+        task.signals.failed.connect(partial(self._on_save_task_done, task, self._on_save_failed))
+        self.save_action.setEnabled(False) # One save at a time
+        self.statusBar.showMessage("Saving session...")
+        self._save_pool.start(self._save_task)
+        return True
+
+    def _on_save_task_done(self, task: _FileTaskRunnable, handler, message: str):
+        """Passes a background save's result to handler, unless a synchronous save superseded the task."""
+        if task is self._save_task:
+            handler(message)
+
+    @pyqtSlot(str)
+    def _on_save_finished(self, filepath: str):
+        """Called on the GUI thread once the session file has been written."""
+        self._save_task = None
+        self.save_action.setEnabled(True)
+        self.update_session_info_display()
+        self.statusBar.showMessage(f"Session saved to {self._current_session_basename}", 3000)
+
+    @pyqtSlot(str)
+    def _on_save_failed(self, error: str):
+        """Called on the GUI thread if writing the session file raised."""
+        self._save_task = None
+        self.save_action.setEnabled(True)
+        self._set_unsaved_changes() # Nothing was saved after all
+        QMessageBox.critical(self, "Save Error", f"Error saving session:\n{error}")
+        self.statusBar.showMessage("Error saving session.", 3000)
 
 
     @pyqtSlot(str)
     def load_session(self, filepath: Optional[str] = None):
         """Loads a session from a JSON file."""
+        self._flush_pending_notes()
         if self._unsaved_changes:
             reply = QMessageBox.question(self, 'Unsaved Changes',
                                          "Loading a new session will discard unsaved changes. Continue?",
@@ -303,9 +461,9 @@ class MainWindow(QMainWindow):
 
         if filepath is None: # If called from menu/button, not history list
              # Prompt user to select a file
-             filepath, _ = QFileDialog.getOpenFileName(self, "Load Session",
-                                                       "", # Default directory (can be set to SESSIONS_DIR)
-                                                       "Kindle PerfMate Sessions (*.json);;All Files (*)")
+             filepath = self._prompt_filepath(QFileDialog.AcceptOpen, "Load Session",
+                                              "", # Starts in the last used directory (can be set to SESSIONS_DIR)
+                                              "Kindle PerfMate Sessions (*.json);;All Files (*)")
              if not filepath:
                  self.statusBar.showMessage("Load cancelled.", 2000)
                  return # User cancelled load dialog
@@ -315,21 +473,21 @@ class MainWindow(QMainWindow):
 
         if loaded_session:
             self.current_session = loaded_session
-            self._current_session_filepath = filepath
+            self._set_session_filepath(filepath)
             self._clear_unsaved_changes() # Loaded session is considered saved initially
 
             # Update all widgets with the loaded session data
             self.load_session_data_into_widgets(self.current_session)
 
             self.update_session_info_display()
-            self.statusBar.showMessage(f"Session loaded from {os.path.basename(filepath)}", 3000)
+            self.statusBar.showMessage(f"Session loaded from {self._current_session_basename}", 3000)
             # Switch to Stopwatch tab after loading
             self.tab_widget.setCurrentWidget(self.stopwatch_widget)
 
         else:
             # Error message is handled by file_manager.load_session
             self.current_session = None # Clear current session on load failure
-            self._current_session_filepath = None
+            self._set_session_filepath(None)
             self._clear_unsaved_changes() # No session = no unsaved changes for previous (discarded) one
             self.load_session_data_into_widgets(None) # Clear widgets
             self.update_session_info_display()
@@ -339,29 +497,48 @@ class MainWindow(QMainWindow):
     @pyqtSlot()
     def export_session(self):
         """Exports the current session data to a CSV file."""
+        self._flush_pending_notes()
         if self.current_session is None:
             QMessageBox.warning(self, "No Session", "No active session to export.")
             return
 
         # Suggest a default filename based on session details
-        week = self.current_session.week.replace(" ", "_").replace("/", "-")
-        device = self.current_session.device.replace(" ", "_").replace("/", "-")
+        week = safe_filename_part(self.current_session.week)
+        device = safe_filename_part(self.current_session.device)
         initial_filename = f"export_{week}_{device}.csv"
 
-        filepath, _ = QFileDialog.getSaveFileName(self, "Export Session Data",
-                                                  initial_filename,
-                                                  "CSV Files (*.csv);;All Files (*)")
+        filepath = self._prompt_filepath(QFileDialog.AcceptSave, "Export Session Data", initial_filename,
+                                         "CSV Files (*.csv);;All Files (*)")
 
         if not filepath:
             self.statusBar.showMessage("Export cancelled.", 2000)
             return
 
-        try:
-            export_session_to_csv(self.current_session, filepath)
-            self.statusBar.showMessage(f"Session exported successfully to {os.path.basename(filepath)}", 3000)
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Error exporting session:\n{e}")
-            self.statusBar.showMessage("Error exporting session.", 3000)
+        # Write the CSV on a worker thread so large sessions don't freeze the UI.
+        # Export a copy, the user may keep editing the live session meanwhile.
+        snapshot = Session.from_dict(self.current_session.to_dict())
+        self._export_task = _FileTaskRunnable(export_session_to_csv, snapshot, filepath)
+        self._export_task.signals.finished.connect(self._on_export_finished)
+        self._export_task.signals.failed.connect(self._on_export_failed)
+        self.export_action.setEnabled(False) # One export at a time
+        self.statusBar.showMessage("Exporting session...")
+        QThreadPool.globalInstance().start(self._export_task)
+
+    @pyqtSlot(str)
+    def _on_export_finished(self, filepath: str):
+        """Called on the GUI thread once the background export has been written."""
+        self._export_task = None
+        self.export_action.setEnabled(True)
+        self.statusBar.showMessage(f"Session exported successfully to {os.path.basename(filepath)}", 3000)
+        self.export_completed.emit(filepath)
+
+    @pyqtSlot(str)
+    def _on_export_failed(self, error: str):
+        """Called on the GUI thread if the background export raised."""
+        self._export_task = None
+        self.export_action.setEnabled(True)
+        QMessageBox.critical(self, "Export Error", f"Error exporting session:\n{error}")
+        self.statusBar.showMessage("Error exporting session.", 3000)
 
 
     def load_session_data_into_widgets(self, session: Optional[Session]):
@@ -373,7 +550,8 @@ class MainWindow(QMainWindow):
         if session:
              self.notes_search_widget.set_global_notes(session.global_notes)
              # Also tell the stopwatch what the default filter is
-             self.stopwatch_widget.priority_filter_combo.setCurrentText(session.priority_filter)
+             priority_filter = session.priority_filter if session.priority_filter in PRIORITY_CHOICES_SET else "All"
+             self.stopwatch_widget.priority_filter_combo.setCurrentText(priority_filter)
         else:
              self.notes_search_widget.set_global_notes("")
              self.stopwatch_widget.priority_filter_combo.setCurrentText("All")
@@ -386,44 +564,12 @@ class MainWindow(QMainWindow):
         # current_test_case_changed(-1, ...) to clear dependent widgets.
 
 
-    @pyqtSlot(int, int, object)
-    def _handle_data_changed(self, row_index_in_filtered_list: int, col_index: int, new_value: object):
-         """Handles data changes originating from the TestTableWidget cell editing."""
-         # This slot is mainly to catch changes that need to set the unsaved flag.
-         # The TestTableWidget *already* updated the data model (self.session_data)
-         # for Notes and Baseline changes.
-         # We just need to ensure the unsaved flag is set.
-         # Iteration data changes from stopwatch also set the flag via connect_signals.
-         # print(f"Main Window: Data changed at filtered row {row_index_in_filtered_list}, col {col_index}. Setting unsaved flag.")
-         self._set_unsaved_changes()
-
-         # If the change was a Test Case Note, update the Notes/Search widget
-         # (although NotesSearchWidget gets the full text when a session is loaded/saved)
-         # A live update could be added here if needed.
-
     @pyqtSlot(str)
     def _handle_global_notes_changed(self, notes_text: str):
          """Handles changes to global notes from the Notes/Search widget."""
          if self.current_session:
               self.current_session.global_notes = notes_text
               # The NotesSearchWidget signal already sets the unsaved flag via connect_signals.
-              # print(f"Main Window: Global notes updated in session data. Setting unsaved flag.")
+              # log.debug("Main Window: Global notes updated in session data.")
          else:
-              print("Warning: Global notes changed but no session is active.")
-
-
-    # Implement event filter for global key presses
-    def eventFilter(self, obj, event):
-        """Filters events for the application."""
-        if event.type() == event.KeyPress and event.key() == Qt.Key_Space:
-            # Check if the stopwatch tab is currently active
-            if self.tab_widget.currentWidget() == self.stopwatch_widget:
-                 # Check if the event originated from a widget that shouldn't
-                 # receive space (like a text editor) - but for simplicity,
-                 # we'll just pass it directly to the stopwatch widget's handler
-                 self.stopwatch_widget.handle_spacebar_press()
-                 return True # Event was handled, don't propagate
-            # elif self.tab_widget.currentWidget() == self.test_table_widget:
-                 # Could add specific spacebar handling for the table (e.g., select next empty iter cell)
-                 # For now, only handle in stopwatch tab
-        return super().eventFilter(obj, event) # Let other events propagate
\ No newline at end of file
+              log.warning("Global notes changed but no session is active.")